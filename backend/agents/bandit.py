@@ -0,0 +1,112 @@
+# backend/agents/bandit.py
+import json
+import random
+import threading
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+ArmKey = Tuple[str, int, str]  # (message_type, template_id, industry)
+
+class ThompsonSamplingSelector:
+    """Beta-Bernoulli Thompson sampling over template x industry arms
+
+    Posterior parameters live in two flat float arrays indexed by arm slot, so
+    selection is a dict lookup plus one betavariate draw per candidate.
+    """
+
+    def __init__(self, prior_successes: float = 1.0, prior_failures: float = 1.0):
+        self.prior_successes = prior_successes
+        self.prior_failures = prior_failures
+        self._slots: Dict[ArmKey, int] = {}
+        self._successes = array("d")
+        self._failures = array("d")
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.update_count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._slots)
+
+    def _slot(self, key: ArmKey) -> int:
+        """Slot of an arm, created at the prior; the caller holds the lock"""
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._successes)
+            self._successes.append(self.prior_successes)
+            self._failures.append(self.prior_failures)
+            self._slots[key] = slot
+        return slot
+
+    def select(self, message_type: str, industry: str, template_ids: Sequence[int]) -> int:
+        """Return the template id with the highest sampled reply probability"""
+        # Read parameters under the lock, so a concurrent restore() or
+        # load_counts() cannot pair new slots with old arrays
+        with self._lock:
+            arms = []
+            for template_id in template_ids:
+                slot = self._slot((message_type, template_id, industry))
+                arms.append((template_id, self._successes[slot], self._failures[slot]))
+
+        best_template, best_sample = template_ids[0], -1.0
+        for template_id, successes, failures in arms:
+            sample = self._random.betavariate(successes, failures)
+            if sample > best_sample:
+                best_template, best_sample = template_id, sample
+        return best_template
+
+    def expected_rate(self, message_type: str, template_id: int, industry: str) -> float:
+        """Posterior mean positive-outcome rate of an arm"""
+        with self._lock:
+            slot = self._slots.get((message_type, template_id, industry))
+            if slot is None:
+                return self.prior_successes / (self.prior_successes + self.prior_failures)
+            successes, failures = self._successes[slot], self._failures[slot]
+        return successes / (successes + failures)
+
+    def update(self, message_type: str, template_id: int, industry: str, reward: bool) -> None:
+        """Fold one observed outcome into the arm's posterior"""
+        with self._lock:
+            slot = self._slot((message_type, template_id, industry))
+            if reward:
+                self._successes[slot] += 1.0
+            else:
+                self._failures[slot] += 1.0
+            self.update_count += 1
+
+    def load_counts(self, counts: List[Tuple[str, int, str, int, int]]) -> None:
+        """Reset posteriors from (message_type, template_id, industry, positives, negatives) rows"""
+        with self._lock:
+            self._slots = {}
+            self._successes = array("d")
+            self._failures = array("d")
+            for message_type, template_id, industry, positives, negatives in counts:
+                self._slots[(message_type, template_id, industry)] = len(self._successes)
+                self._successes.append(self.prior_successes + positives)
+                self._failures.append(self.prior_failures + negatives)
+
+    def snapshot(self) -> bytes:
+        """Serialize arms as a JSON key header followed by the raw float arrays"""
+        with self._lock:
+            keys = sorted(self._slots, key=self._slots.get)
+            header = json.dumps({"keys": keys, "itemsize": self._successes.itemsize})
+            return header.encode("utf-8") + b"\n" + self._successes.tobytes() + self._failures.tobytes()
+
+    def restore(self, data: bytes) -> None:
+        """Replace posteriors with a snapshot produced by snapshot()"""
+        header, _, payload = data.partition(b"\n")
+        meta = json.loads(header)
+        keys = [tuple(key) for key in meta["keys"]]
+
+        successes, failures = array("d"), array("d")
+        if meta["itemsize"] != successes.itemsize:
+            raise ValueError("Snapshot was written with an incompatible float size")
+
+        half = len(keys) * successes.itemsize
+        successes.frombytes(payload[:half])
+        failures.frombytes(payload[half:2 * half])
+
+        with self._lock:
+            self._slots = {key: slot for slot, key in enumerate(keys)}
+            self._successes = successes
+            self._failures = failures
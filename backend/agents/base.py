@@ -1,51 +1,106 @@
 # backend/agents/base.py
-from langgraph.graph import StateGraph, END
-from typing import TypedDict, List, Optional, Any
-from pydantic import BaseModel
-import uuid
-from datetime import datetime
+from typing import TypedDict, List, Optional, Any, Dict, Annotated, Callable
+from dataclasses import dataclass, field
+import threading
 
-# Global state for our multi-agent system
+@dataclass(slots=True, frozen=True)
+class MessageVariant:
+    """One personalized message; slotted to keep per-variant overhead small"""
+    message_type: str
+    template_id: int
+    content: str
+    tone: str
+    confidence_score: float
+    personalization_elements: Dict[str, str] = field(default_factory=dict)
+
+def add_errors(current: Optional[List[str]], update: Optional[List[str]]) -> List[str]:
+    """Reducer for errors: nodes append, None clears (new run or resume)"""
+    if update is None:
+        return []
+    return (current or []) + update
+
+def add_messages(
+    current: Optional[List[MessageVariant]],
+    update: Optional[List[MessageVariant]]
+) -> List[MessageVariant]:
+    """Reducer for message variants: parallel personalization branches append, None clears"""
+    if update is None:
+        return []
+    return (current or []) + update
+
+def merge_selected(
+    current: Optional[Dict[str, MessageVariant]],
+    update: Optional[Dict[str, MessageVariant]]
+) -> Dict[str, MessageVariant]:
+    """Reducer for per-type selections: each branch adds its message type, None clears"""
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
+# Global state for our multi-agent system.
+# Nodes return only the keys they change; LangGraph merges those deltas, and
+# annotated keys are combined with their reducer instead of being overwritten.
 class LinkedIntelligenceState(TypedDict):
     # Input data
     user_id: str
     profile_url: str
-    message_type: str
+    message_type: str  # Primary type; selected_message is chosen for it
+    message_types: List[str]  # All types to generate, one parallel branch each
     
-    # Profile analysis
+    # Profile analysis (profile_data references the shared cached blob)
     profile_data: Optional[dict]
     ai_insights: Optional[dict]
     engagement_score: Optional[float]
+    profile_embedding: Optional[bytes]  # float32 vector for similar-profile search
     
-    # Message generation
-    message_templates: Optional[List[str]]
-    personalized_messages: Optional[List[dict]]
-    selected_message: Optional[dict]
+    # Message generation (templates stay on the agent, not in the state)
+    personalized_messages: Annotated[List[MessageVariant], add_messages]
+    selected_messages: Annotated[Dict[str, MessageVariant], merge_selected]
+    selected_message: Optional[MessageVariant]
     
     # Workflow control
     current_step: str
     next_action: str
-    errors: List[str]
+    errors: Annotated[List[str], add_errors]
     metadata: dict
 
+StateUpdate = Dict[str, Any]
+
 class BaseAgent:
     """Base class for all agents in the system"""
     
     def __init__(self, name: str):
         self.name = name
         self.execution_count = 0
+        self._count_lock = threading.Lock()  # Parallel branches share the agent
+    
+    def _next_run(self) -> int:
+        with self._count_lock:
+            self.execution_count += 1
+            return self.execution_count
     
-    def execute(self, state: LinkedIntelligenceState) -> LinkedIntelligenceState:
-        """Execute the agent's main logic"""
-        self.execution_count += 1
-        print(f"Executing {self.name} (run #{self.execution_count})")
+    def execute(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Execute the agent's main logic and return the state delta"""
+        print(f"Executing {self.name} (run #{self._next_run()})")
         
         try:
             return self._execute_logic(state)
         except Exception as e:
-            state["errors"].append(f"{self.name}: {str(e)}")
-            return state
+            return {"errors": [f"{self.name}: {str(e)}"]}
+    
+    def node(self, step: Callable[[LinkedIntelligenceState], StateUpdate]) -> Callable[[LinkedIntelligenceState], StateUpdate]:
+        """Wrap one step of the agent as a graph node with execute()'s error handling"""
+        def run(state: LinkedIntelligenceState) -> StateUpdate:
+            print(f"Executing {self.name}.{step.__name__} (run #{self._next_run()})")
+            
+            try:
+                return step(state)
+            except Exception as e:
+                return {"errors": [f"{self.name}: {str(e)}"]}
+        
+        run.__name__ = step.__name__
+        return run
     
-    def _execute_logic(self, state: LinkedIntelligenceState) -> LinkedIntelligenceState:
+    def _execute_logic(self, state: LinkedIntelligenceState) -> StateUpdate:
         """Override this method in subclasses"""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
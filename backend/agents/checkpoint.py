@@ -0,0 +1,49 @@
+# backend/agents/checkpoint.py
+import os
+import sqlite3
+from typing import Optional
+
+def default_checkpoint_url() -> str:
+    """Postgres deployments checkpoint into the app database; everything else into a local SQLite file"""
+    url = os.getenv("CHECKPOINT_URL")
+    if url:
+        return url
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if database_url.startswith("postgresql"):
+        return database_url
+    return "sqlite:///checkpoints.sqlite"
+
+def build_checkpointer(url: Optional[str] = None):
+    """Create the LangGraph checkpointer for a postgresql:// or sqlite:// URL"""
+    url = url or default_checkpoint_url()
+
+    if url.startswith("postgresql"):
+        from langgraph.checkpoint.postgres import PostgresSaver
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+
+        # psycopg takes a plain libpq URL, without SQLAlchemy's driver suffix
+        scheme, _, rest = url.partition("://")
+        pool = ConnectionPool(
+            f"postgresql://{rest}",
+            max_size=int(os.getenv("CHECKPOINT_POOL_SIZE", "10")),
+            kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+            open=True
+        )
+        checkpointer = PostgresSaver(pool)
+        checkpointer.setup()
+        return checkpointer
+
+    if url.startswith("sqlite"):
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        path = url.split(":///", 1)[1] if ":///" in url else ":memory:"
+        return SqliteSaver(sqlite3.connect(path or ":memory:", check_same_thread=False))
+
+    if url == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+    raise ValueError(f"Unsupported checkpoint URL: {url}")
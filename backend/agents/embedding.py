@@ -0,0 +1,76 @@
+# backend/agents/embedding.py
+from .base import BaseAgent, LinkedIntelligenceState, StateUpdate
+from .profile_fields import extract_title, extract_company, extract_industry, extract_recent_post_text
+from typing import Dict, Any, Optional
+import hashlib
+import math
+import re
+import struct
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Also sizes the VECTOR column of models.embedding.ProfileEmbedding on Postgres;
+# changing it needs a migration
+EMBEDDING_DIM = 256
+
+# Lead similarity is mostly about role and company, less about who posted what
+FIELD_WEIGHTS = {"title": 2.0, "company": 1.5, "industry": 1.0, "location": 0.5, "posts": 0.5}
+
+class HashingEmbedder:
+    """Deterministic feature-hashing embedder
+    
+    Needs no model download or network, and gives the same vector on every
+    machine and run, so stored vectors never go stale between workers.
+    Vectors are L2-normalized float32, so a dot product is the cosine similarity.
+    """
+    
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+    
+    def features(self, profile_data: Dict[str, Any]) -> Dict[str, float]:
+        """Weighted field-tagged tokens plus title bigrams"""
+        fields = {
+            "title": extract_title(profile_data),
+            "company": extract_company(profile_data),
+            "industry": extract_industry(profile_data),
+            "location": profile_data.get("location") or "",
+            "posts": extract_recent_post_text(profile_data)
+        }
+        
+        weights: Dict[str, float] = {}
+        for field, text in fields.items():
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            features = [f"{field}:{token}" for token in tokens]
+            if field == "title":
+                features += [f"title:{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                weights[feature] = weights.get(feature, 0.0) + FIELD_WEIGHTS[field]
+        return weights
+    
+    def embed(self, profile_data: Dict[str, Any]) -> bytes:
+        """Embed a profile as little-endian float32 bytes"""
+        vector = [0.0] * self.dim
+        for feature, weight in self.features(profile_data).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            # Top bit picks the sign so colliding features tend to cancel out
+            sign = -1.0 if digest >> 63 else 1.0
+            vector[digest % self.dim] += sign * math.sqrt(weight)
+        
+        # An empty profile stays a zero vector and is similar to nothing
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return struct.pack(f"<{self.dim}f", *(value / norm for value in vector))
+
+class EmbeddingAgent(BaseAgent):
+    """Agent that embeds analyzed profiles for similar-lead search"""
+    
+    def __init__(self, embedder: Optional[HashingEmbedder] = None):
+        super().__init__("EmbeddingAgent")
+        self.embedder = embedder or HashingEmbedder()
+    
+    def _execute_logic(self, state: LinkedIntelligenceState) -> StateUpdate:
+        return self.embed_profile(state)
+    
+    def embed_profile(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Embedding branch; runs alongside insights and scoring"""
+        return {"profile_embedding": self.embedder.embed(state["profile_data"])}
@@ -1,44 +1,77 @@
 # backend/agents/orchestrator.py
+from langgraph.constants import Send
 from langgraph.graph import StateGraph, END
-from .base import LinkedIntelligenceState
+from .base import LinkedIntelligenceState, StateUpdate
+from .checkpoint import build_checkpointer
+from .profile_cache import normalize_profile_url
 from .profile_intelligence import ProfileIntelligenceAgent
 from .personalization import PersonalizationAgent
+from .embedding import EmbeddingAgent
+from typing import List, Optional, Sequence, Union
+import asyncio
+import hashlib
+
+def make_workflow_id(user_id: str, profile_url: str, message_types: Sequence[str]) -> str:
+    """Stable workflow id, so a retried request maps onto the same checkpoint thread"""
+    key = f"{normalize_profile_url(profile_url)}|{','.join(message_types)}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f"workflow_{user_id}_{digest}"
 
 class LinkedIntelligenceOrchestrator:
     """Main orchestrator for the multi-agent workflow"""
     
-    def __init__(self):
+    def __init__(self, checkpointer=None):
         self.profile_agent = ProfileIntelligenceAgent()
         self.personalization_agent = PersonalizationAgent()
+        self.embedding_agent = EmbeddingAgent()
+        self.checkpointer = checkpointer if checkpointer is not None else build_checkpointer()
         self.graph = self._build_graph()
     
     def _build_graph(self) -> StateGraph:
-        """Build the agent workflow graph"""
+        """Build the agent workflow graph
+        
+        fetch_profile fans out to the independent insights, scoring and
+        embedding branches, which join at profile_analysis. Personalization then fans
+        out once per requested message type and joins again, so a run takes
+        as long as its slowest branch rather than the sum of all steps.
+        """
         
         # Create the state graph
         workflow = StateGraph(LinkedIntelligenceState)
         
         # Add agent nodes
-        workflow.add_node("profile_analysis", self.profile_agent.execute)
+        workflow.add_node("fetch_profile", self.profile_agent.node(self.profile_agent.fetch_profile))
+        workflow.add_node("generate_insights", self.profile_agent.node(self.profile_agent.generate_insights))
+        workflow.add_node("score_engagement", self.profile_agent.node(self.profile_agent.score_engagement))
+        workflow.add_node("embed_profile", self.embedding_agent.node(self.embedding_agent.embed_profile))
+        workflow.add_node("profile_analysis", self._join_profile_analysis)
         workflow.add_node("personalization", self.personalization_agent.execute)
+        workflow.add_node("personalization_join", self._join_personalization)
         workflow.add_node("error_handler", self._handle_errors)
         
         # Define the workflow
-        workflow.set_entry_point("profile_analysis")
+        workflow.set_entry_point("fetch_profile")
         
         # Add conditional edges
+        workflow.add_conditional_edges(
+            "fetch_profile",
+            self._route_after_fetch,
+            ["generate_insights", "score_engagement", "embed_profile", "error_handler"]
+        )
+        
+        # The join waits for all analysis branches
+        workflow.add_edge(["generate_insights", "score_engagement", "embed_profile"], "profile_analysis")
+        
         workflow.add_conditional_edges(
             "profile_analysis",
             self._route_after_profile_analysis,
-            {
-                "personalization": "personalization",
-                "error": "error_handler",
-                "end": END
-            }
+            ["personalization", "error_handler", END]
         )
         
+        workflow.add_edge("personalization", "personalization_join")
+        
         workflow.add_conditional_edges(
-            "personalization",
+            "personalization_join",
             self._route_after_personalization,
             {
                 "end": END,
@@ -48,17 +81,50 @@ class LinkedIntelligenceOrchestrator:
         
         workflow.add_edge("error_handler", END)
         
-        return workflow.compile()
+        # Every node's output is checkpointed under the workflow id (thread_id)
+        return workflow.compile(checkpointer=self.checkpointer)
     
-    def _route_after_profile_analysis(self, state: LinkedIntelligenceState) -> str:
+    def _route_after_fetch(self, state: LinkedIntelligenceState) -> Union[str, List[str]]:
+        """Run the analysis branches in parallel once the profile is loaded"""
+        if state.get("errors"):
+            return "error_handler"
+        
+        return ["generate_insights", "score_engagement", "embed_profile"]
+    
+    def _join_profile_analysis(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Join point of the insights, scoring and embedding branches"""
+        return {
+            "current_step": "profile_analysis_complete",
+            "next_action": "generate_messages"
+        }
+    
+    def _route_after_profile_analysis(self, state: LinkedIntelligenceState) -> Union[str, List[Send]]:
         """Decide next step after profile analysis"""
         if state.get("errors"):
-            return "error"
+            return "error_handler"
         
-        if state.get("next_action") == "generate_messages":
-            return "personalization"
+        if state.get("next_action") != "generate_messages":
+            return END
         
-        return "end"
+        # One personalization branch per message type
+        return [
+            Send("personalization", {
+                "profile_data": state["profile_data"],
+                "ai_insights": state["ai_insights"],
+                "message_type": message_type
+            })
+            for message_type in state.get("message_types") or [state["message_type"]]
+        ]
+    
+    def _join_personalization(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Join point of the per-type personalization branches"""
+        selected_messages = state.get("selected_messages") or {}
+        
+        return {
+            "selected_message": selected_messages.get(state["message_type"]),
+            "current_step": "personalization_complete",
+            "next_action": "ready_for_sending"
+        }
     
     def _route_after_personalization(self, state: LinkedIntelligenceState) -> str:
         """Decide next step after personalization"""
@@ -67,44 +133,132 @@ class LinkedIntelligenceOrchestrator:
         
         return "end"
     
-    def _handle_errors(self, state: LinkedIntelligenceState) -> LinkedIntelligenceState:
+    def _handle_errors(self, state: LinkedIntelligenceState) -> StateUpdate:
         """Handle errors in the workflow"""
         errors = state.get("errors", [])
         print(f"Workflow errors: {errors}")
         
-        state.update({
+        return {
             "current_step": "error_handled",
             "next_action": "end"
-        })
+        }
+    
+    def _config(self, workflow_id: str) -> dict:
+        return {"configurable": {"thread_id": workflow_id}}
+    
+    async def _invoke(self, state: Optional[LinkedIntelligenceState], config: dict) -> LinkedIntelligenceState:
+        """Run the graph in a worker thread so the event loop keeps serving requests"""
+        return await asyncio.to_thread(self.graph.invoke, state, config)
+    
+    def get_workflow(self, workflow_id: str) -> Optional[LinkedIntelligenceState]:
+        """Latest checkpointed state of a workflow, or None if it never ran"""
+        snapshot = self.graph.get_state(self._config(workflow_id))
+        return snapshot.values or None
+    
+    def _is_incomplete(self, snapshot) -> bool:
+        """A run that crashed mid-graph or ended in the error handler"""
+        if not snapshot.values:
+            return False
+        return bool(snapshot.next) or snapshot.values.get("current_step") == "error_handled"
+    
+    async def resume_workflow(self, workflow_id: str) -> Optional[LinkedIntelligenceState]:
+        """Continue a workflow from its last completed node instead of restarting it"""
+        config = self._config(workflow_id)
+        snapshot = self.graph.get_state(config)
+        
+        if not snapshot.values:
+            return None
+        
+        if not self._is_incomplete(snapshot):
+            return snapshot.values
         
-        return state
+        if snapshot.next:
+            # Interrupted mid-run: pending nodes are still scheduled in the checkpoint,
+            # and writes of parallel branches that already finished are reused
+            return await self._invoke(None, config)
+        
+        values = snapshot.values
+        if values.get("profile_data") and values.get("ai_insights") and values.get("engagement_score") is not None:
+            # Profile analysis already succeeded; rerun only what comes after it
+            self.graph.update_state(
+                config,
+                {
+                    "errors": None,
+                    "personalized_messages": None,
+                    "selected_messages": None,
+                    "current_step": "profile_analysis_complete",
+                    "next_action": "generate_messages"
+                },
+                as_node="profile_analysis"
+            )
+            return await self._invoke(None, config)
+        
+        # Nothing reusable was checkpointed; start over on the same thread
+        return await self._invoke(self._initial_state(
+            values["user_id"],
+            values["profile_url"],
+            values["message_type"],
+            values.get("message_types") or [values["message_type"]],
+            workflow_id
+        ), config)
     
-    async def process_profile(
-        self, 
-        user_id: str, 
-        profile_url: str, 
-        message_type: str = "connection_request"
+    def _initial_state(
+        self,
+        user_id: str,
+        profile_url: str,
+        message_type: str,
+        message_types: List[str],
+        workflow_id: str
     ) -> LinkedIntelligenceState:
-        """Process a LinkedIn profile through the agent workflow"""
-        
-        # Initialize state
-        initial_state = LinkedIntelligenceState(
+        return LinkedIntelligenceState(
             user_id=user_id,
             profile_url=profile_url,
             message_type=message_type,
+            message_types=message_types,
             profile_data=None,
             ai_insights=None,
             engagement_score=None,
-            message_templates=None,
+            profile_embedding=None,
             personalized_messages=None,
+            selected_messages=None,
             selected_message=None,
             current_step="initialized",
             next_action="analyze_profile",
-            errors=[],
-            metadata={"workflow_id": f"workflow_{user_id}_{hash(profile_url)}"}
+            errors=None,  # Clears errors left on the thread by an earlier run
+            metadata={"workflow_id": workflow_id}
         )
+    
+    async def process_profile(
+        self, 
+        user_id: str, 
+        profile_url: str, 
+        message_type: str = "connection_request",
+        message_types: Optional[Sequence[str]] = None,
+        refresh: bool = False
+    ) -> LinkedIntelligenceState:
+        """Process a LinkedIn profile through the agent workflow
+        
+        message_type is the primary type that selected_message is chosen for;
+        message_types adds further types generated in parallel in the same run.
+        refresh fetches the profile again instead of using this worker's cached copy.
+        """
+        
+        if refresh:
+            self.profile_agent.profile_cache.invalidate(profile_url)
+        
+        # Primary type first, duplicates dropped
+        message_types = list(dict.fromkeys([message_type, *(message_types or [])]))
+        workflow_id = make_workflow_id(user_id, profile_url, message_types)
+        config = self._config(workflow_id)
+        
+        # A retry of a failed or interrupted run picks up where it stopped
+        if self._is_incomplete(self.graph.get_state(config)):
+            return await self.resume_workflow(workflow_id)
         
         # Execute the workflow
-        result = self.graph.invoke(initial_state)
+        result = await self._invoke(
+            self._initial_state(user_id, profile_url, message_type, message_types, workflow_id),
+            config
+        )
         
-        return result
\ No newline at end of file
+        return result
@@ -1,12 +1,15 @@
 # backend/agents/personalization.py
-from .base import BaseAgent, LinkedIntelligenceState
-from typing import List, Dict, Any
+from .base import BaseAgent, LinkedIntelligenceState, MessageVariant, StateUpdate
+from .bandit import ThompsonSamplingSelector
+from .profile_fields import extract_company, extract_industry
+from typing import List, Dict, Any, Optional
 
 class PersonalizationAgent(BaseAgent):
     """Agent responsible for generating personalized messages"""
     
-    def __init__(self):
+    def __init__(self, selector: Optional[ThompsonSamplingSelector] = None):
         super().__init__("PersonalizationAgent")
+        self.selector = selector or ThompsonSamplingSelector()
         self.message_templates = {
             "connection_request": [
                 "Hi {name}, I noticed your work at {company} and would love to connect!",
@@ -19,14 +22,13 @@ class PersonalizationAgent(BaseAgent):
             ]
         }
     
-    def _execute_logic(self, state: LinkedIntelligenceState) -> LinkedIntelligenceState:
+    def _execute_logic(self, state: LinkedIntelligenceState) -> StateUpdate:
         profile_data = state.get("profile_data")
         ai_insights = state.get("ai_insights")
         message_type = state.get("message_type", "connection_request")
         
         if not profile_data or not ai_insights:
-            state["errors"].append("Missing profile data or insights")
-            return state
+            return {"errors": ["Missing profile data or insights"]}
         
         # Generate personalized messages
         personalized_messages = self._generate_personalized_messages(
@@ -34,87 +36,85 @@ class PersonalizationAgent(BaseAgent):
         )
         
         # Select best message
-        selected_message = self._select_best_message(personalized_messages, ai_insights)
+        selected_message = self._select_best_message(
+            personalized_messages, ai_insights, message_type, self._extract_industry(profile_data)
+        )
         
-        # Update state
-        state.update({
-            "message_templates": self.message_templates.get(message_type, []),
+        # One branch per message type runs in parallel, so only write the
+        # reducer keys here; the orchestrator's join sets the workflow step
+        return {
             "personalized_messages": personalized_messages,
-            "selected_message": selected_message,
-            "current_step": "personalization_complete",
-            "next_action": "ready_for_sending"
-        })
-        
-        return state
+            "selected_messages": {message_type: selected_message} if selected_message else {}
+        }
     
     def _generate_personalized_messages(
         self, 
         profile_data: Dict[str, Any], 
         ai_insights: Dict[str, Any], 
         message_type: str
-    ) -> List[Dict[str, Any]]:
+    ) -> List[MessageVariant]:
         """Generate multiple personalized message variants"""
         
         templates = self.message_templates.get(message_type, [])
         personalized = []
         
+        # Extract personalization data
+        name = profile_data.get("name", "").split()[0]  # First name
+        company = self._extract_company(profile_data)
+        industry = self._extract_industry(profile_data)
+        topic = self._extract_recent_topic(profile_data)
+        tone = ai_insights.get("message_tone", "professional")
+        personalization_elements = {
+            "name": name,
+            "company": company,
+            "topic": topic
+        }
+        
         for i, template in enumerate(templates):
-            # Extract personalization data
-            name = profile_data.get("name", "").split()[0]  # First name
-            company = self._extract_company(profile_data)
-            industry = self._extract_industry(profile_data)
-            topic = self._extract_recent_topic(profile_data)
-            
             # Personalize the template
             personalized_message = template.format(
                 name=name,
                 company=company,
                 industry=industry,
                 topic=topic,
+                industry_trend=topic,
                 company_initiative="your latest product launch"  # TODO: Extract from news
             )
             
-            personalized.append({
-                "id": i,
-                "template_id": i,
-                "content": personalized_message,
-                "tone": ai_insights.get("message_tone", "professional"),
-                "confidence_score": 0.8,  # TODO: Calculate based on personalization quality
-                "personalization_elements": {
-                    "name": name,
-                    "company": company,
-                    "topic": topic
-                }
-            })
+            personalized.append(MessageVariant(
+                message_type=message_type,
+                template_id=i,
+                content=personalized_message,
+                tone=tone,
+                confidence_score=self.selector.expected_rate(message_type, i, industry),
+                personalization_elements=personalization_elements
+            ))
         
         return personalized
     
     def _select_best_message(
         self, 
-        messages: List[Dict[str, Any]], 
-        ai_insights: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Select the best message based on AI insights"""
+        messages: List[MessageVariant], 
+        ai_insights: Dict[str, Any],
+        message_type: str,
+        industry: str
+    ) -> Optional[MessageVariant]:
+        """Select the best message by Thompson sampling over recorded outcomes"""
         if not messages:
-            return {}
+            return None
         
-        # For now, select highest confidence score
-        # TODO: Implement ML-based selection
-        return max(messages, key=lambda x: x.get("confidence_score", 0))
+        template_id = self.selector.select(
+            message_type, industry, [message.template_id for message in messages]
+        )
+        return next(message for message in messages if message.template_id == template_id)
     
     def _extract_company(self, profile_data: Dict[str, Any]) -> str:
         """Extract current company from profile"""
-        experience = profile_data.get("experience", [])
-        if experience:
-            return experience[0].get("company", "your company")
-        return "your company"
+        return extract_company(profile_data, default="your company")
     
     def _extract_industry(self, profile_data: Dict[str, Any]) -> str:
         """Extract industry from profile"""
-        title = profile_data.get("title", "")
-        if "engineer" in title.lower():
-            return "tech"
-        return "professional"
+        return extract_industry(profile_data)
     
     def _extract_recent_topic(self, profile_data: Dict[str, Any]) -> str:
         """Extract recent topic from posts"""
@@ -0,0 +1,78 @@
+# backend/agents/profile_cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+ProfileBlob = Dict[str, Any]
+
+def normalize_profile_url(profile_url: str) -> str:
+    """Canonical form of a profile URL: https, lowercase, no www., query, fragment or trailing slash
+
+    linkedin.com/in/Jane, https://www.linkedin.com/in/jane/ and
+    https://linkedin.com/in/jane?trk=x all name the same profile
+    (LinkedIn vanity names are case-insensitive).
+    """
+    url = profile_url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"https://{host}{parts.path.rstrip('/').lower()}"
+
+class ProfileBlobCache:
+    """LRU cache of fetched profile blobs with a time-to-live
+
+    Workflow states hold a reference to the cached blob rather than their own
+    copy, so concurrent or repeated analyses of one profile share one object.
+    Blobs must be treated as read-only. Entries expire after ttl_seconds so a
+    changed profile is eventually fetched again; invalidate() drops one early.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv("PROFILE_CACHE_SIZE", "1024"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "900"))
+        self._blobs: "OrderedDict[str, Tuple[float, ProfileBlob]]" = OrderedDict()  # url -> (expires_at, blob)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def get(self, profile_url: str) -> Optional[ProfileBlob]:
+        profile_url = normalize_profile_url(profile_url)
+        with self._lock:
+            entry = self._blobs.get(profile_url)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at <= time.monotonic():
+                del self._blobs[profile_url]
+                return None
+            self._blobs.move_to_end(profile_url)
+            return blob
+
+    def put(self, profile_url: str, blob: ProfileBlob) -> ProfileBlob:
+        profile_url = normalize_profile_url(profile_url)
+        with self._lock:
+            self._blobs[profile_url] = (time.monotonic() + self.ttl_seconds, blob)
+            self._blobs.move_to_end(profile_url)
+            while len(self._blobs) > self.max_entries:
+                self._blobs.popitem(last=False)
+            return blob
+
+    def invalidate(self, profile_url: str) -> None:
+        """Forget a profile so its next analysis fetches it again"""
+        with self._lock:
+            self._blobs.pop(normalize_profile_url(profile_url), None)
+
+    def get_or_fetch(self, profile_url: str, fetch: Callable[[str], ProfileBlob]) -> ProfileBlob:
+        """Return the cached blob, fetching and caching it on a miss"""
+        blob = self.get(profile_url)
+        if blob is None:
+            blob = self.put(profile_url, fetch(profile_url))
+        return blob
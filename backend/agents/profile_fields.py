@@ -0,0 +1,29 @@
+# backend/agents/profile_fields.py
+from typing import Dict, Any
+
+def extract_name(profile_data: Dict[str, Any]) -> str:
+    """Extract the full name from profile data"""
+    return profile_data.get("name") or ""
+
+def extract_title(profile_data: Dict[str, Any]) -> str:
+    """Extract the headline/title from profile data"""
+    return profile_data.get("title") or ""
+
+def extract_company(profile_data: Dict[str, Any], default: str = "") -> str:
+    """Extract current company from the most recent experience entry"""
+    experience = profile_data.get("experience") or []
+    if experience:
+        return experience[0].get("company") or default
+    return default
+
+def extract_industry(profile_data: Dict[str, Any]) -> str:
+    """Extract industry from profile title"""
+    title = extract_title(profile_data)
+    if "engineer" in title.lower():
+        return "tech"
+    return "professional"
+
+def extract_recent_post_text(profile_data: Dict[str, Any], limit: int = 5) -> str:
+    """Concatenate the content of the most recent posts"""
+    recent_posts = profile_data.get("recent_posts") or []
+    return " ".join(post.get("content", "") for post in recent_posts[:limit])
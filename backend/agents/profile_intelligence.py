@@ -1,24 +1,52 @@
 # backend/agents/profile_intelligence.py
-from .base import BaseAgent, LinkedIntelligenceState
-from typing import Dict, Any
-import json
+from .base import BaseAgent, LinkedIntelligenceState, StateUpdate
+from .profile_cache import ProfileBlobCache
+from typing import Dict, Any, Optional
 
 class ProfileIntelligenceAgent(BaseAgent):
     """Agent responsible for analyzing LinkedIn profiles and extracting insights"""
     
-    def __init__(self):
+    def __init__(self, profile_cache: Optional[ProfileBlobCache] = None):
         super().__init__("ProfileIntelligenceAgent")
+        self.profile_cache = profile_cache or ProfileBlobCache()
     
-    def _execute_logic(self, state: LinkedIntelligenceState) -> LinkedIntelligenceState:
+    def _execute_logic(self, state: LinkedIntelligenceState) -> StateUpdate:
+        # Run the steps in sequence; the orchestrator runs them as separate graph nodes
+        update = self.fetch_profile(state)
+        if update.get("errors"):
+            return update
+        
+        state = {**state, **update}
+        update.update(self.generate_insights(state))
+        update.update(self.score_engagement(state))
+        update.update({
+            "current_step": "profile_analysis_complete",
+            "next_action": "generate_messages"
+        })
+        return update
+    
+    def fetch_profile(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Load the profile blob, shared through the profile cache"""
         profile_url = state.get("profile_url")
         
         if not profile_url:
-            state["errors"].append("No profile URL provided")
-            return state
+            return {"errors": ["No profile URL provided"]}
         
+        return {"profile_data": self.profile_cache.get_or_fetch(profile_url, self._fetch_profile)}
+    
+    def generate_insights(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Insights branch; independent of scoring, so both run concurrently"""
+        return {"ai_insights": self._generate_insights(state["profile_data"])}
+    
+    def score_engagement(self, state: LinkedIntelligenceState) -> StateUpdate:
+        """Engagement scoring branch"""
+        return {"engagement_score": self._calculate_engagement_score(state["profile_data"])}
+    
+    def _fetch_profile(self, profile_url: str) -> Dict[str, Any]:
+        """Fetch raw profile data for a LinkedIn URL"""
         # TODO: Implement actual LinkedIn scraping
         # For now, return mock data
-        mock_profile_data = {
+        return {
             "name": "John Doe",
             "title": "Software Engineer at TechCorp",
             "location": "San Francisco, CA",
@@ -31,23 +59,6 @@ class ProfileIntelligenceAgent(BaseAgent):
                 {"company": "TechCorp", "role": "Software Engineer", "years": 2}
             ]
         }
-        
-        # Generate AI insights
-        ai_insights = self._generate_insights(mock_profile_data)
-        
-        # Calculate engagement score
-        engagement_score = self._calculate_engagement_score(mock_profile_data)
-        
-        # Update state
-        state.update({
-            "profile_data": mock_profile_data,
-            "ai_insights": ai_insights,
-            "engagement_score": engagement_score,
-            "current_step": "profile_analysis_complete",
-            "next_action": "generate_messages"
-        })
-        
-        return state
     
     def _generate_insights(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate AI-powered insights from profile data"""
@@ -78,4 +89,4 @@ class ProfileIntelligenceAgent(BaseAgent):
             score += 0.2
         
         # Cap at 1.0
-        return min(score, 1.0)
\ No newline at end of file
+        return min(score, 1.0)
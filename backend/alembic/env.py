@@ -13,6 +13,10 @@ sys.path.append(os.path.dirname(__file__))
 from models.base import Base
 from models.user import User
 from models.profile import LinkedInProfile
+from models.search import ProfileSearchDocument
+from models.analytics import AnalyticsRollup
+from models.message import GeneratedMessage
+from models.embedding import ProfileEmbedding
 
 config = context.config
 fileConfig(config.config_file_name)
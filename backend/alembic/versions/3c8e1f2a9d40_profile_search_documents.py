@@ -0,0 +1,87 @@
+"""Profile search documents
+
+Revision ID: 3c8e1f2a9d40
+Revises: 7b9977376d12
+Create Date: 2026-10-19 09:12:41.220417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f2a9d40'
+down_revision: Union[str, None] = '7b9977376d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Search documents for profiles analyzed before search existed, built in SQL the
+# way services.search.build_search_fields and PostgresSearchIndex.index_profile do:
+# name, title, first experience's company and the first 5 posts' content
+BACKFILL_SEARCH_DOCUMENTS_SQL = """
+    WITH fields AS (
+        SELECT
+            p.id,
+            p.user_id,
+            COALESCE(p.profile_data::jsonb ->> 'name', '') AS name,
+            COALESCE(p.profile_data::jsonb ->> 'title', '') AS title,
+            COALESCE(p.profile_data::jsonb -> 'experience' -> 0 ->> 'company', '') AS company,
+            COALESCE((
+                SELECT string_agg(COALESCE(post ->> 'content', ''), ' ' ORDER BY position)
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(p.profile_data::jsonb -> 'recent_posts') = 'array'
+                        THEN p.profile_data::jsonb -> 'recent_posts' ELSE '[]'::jsonb END
+                ) WITH ORDINALITY AS posts(post, position)
+                WHERE position <= 5
+            ), '') AS posts
+        FROM linkedin_profiles p
+        WHERE p.user_id IS NOT NULL
+    )
+    INSERT INTO profile_search_documents (profile_id, user_id, document, search_vector, updated_at)
+    SELECT
+        id,
+        user_id,
+        concat_ws(' ', NULLIF(name, ''), NULLIF(title, ''), NULLIF(company, ''), NULLIF(posts, '')),
+        setweight(to_tsvector('simple', name), 'A')
+            || setweight(to_tsvector('simple', title || ' ' || company), 'B')
+            || setweight(to_tsvector('simple', posts), 'C'),
+        timezone('utc', now())
+    FROM fields
+    ON CONFLICT (profile_id) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table('profile_search_documents',
+    sa.Column('profile_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['linkedin_profiles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('profile_id')
+    )
+    op.create_index(op.f('ix_profile_search_documents_user_id'), 'profile_search_documents', ['user_id'], unique=False)
+    op.create_index('ix_profile_search_documents_search_vector', 'profile_search_documents', ['search_vector'], unique=False, postgresql_using='gin')
+    # gin_trgm_ops serves the word-similarity operator (query <% document) used by search
+    op.create_index(
+        'ix_profile_search_documents_document_trgm',
+        'profile_search_documents',
+        ['document'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'document': 'gin_trgm_ops'}
+    )
+    op.execute(BACKFILL_SEARCH_DOCUMENTS_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_profile_search_documents_document_trgm', table_name='profile_search_documents')
+    op.drop_index('ix_profile_search_documents_search_vector', table_name='profile_search_documents')
+    op.drop_index(op.f('ix_profile_search_documents_user_id'), table_name='profile_search_documents')
+    op.drop_table('profile_search_documents')
@@ -0,0 +1,28 @@
+"""Profile export indexes
+
+Revision ID: 5f1a7c3e9b28
+Revises: d2b6f09e7c15
+Create Date: 2026-10-19 14:02:37.519204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1a7c3e9b28'
+down_revision: Union[str, None] = 'd2b6f09e7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_linkedin_profiles_user_last_analyzed', 'linkedin_profiles', ['user_id', 'last_analyzed'], unique=False)
+    op.create_index('ix_linkedin_profiles_user_created_at', 'linkedin_profiles', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_linkedin_profiles_user_created_at', table_name='linkedin_profiles')
+    op.drop_index('ix_linkedin_profiles_user_last_analyzed', table_name='linkedin_profiles')
@@ -0,0 +1,50 @@
+"""Profile embeddings
+
+Revision ID: 8e4d2a6c1f57
+Revises: 5f1a7c3e9b28
+Create Date: 2026-10-19 16:21:08.331749
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.embedding import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4d2a6c1f57'
+down_revision: Union[str, None] = '5f1a7c3e9b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    if postgres:
+        op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    embedding_type = Vector(256) if postgres else sa.LargeBinary()
+    op.create_table('profile_embeddings',
+    sa.Column('profile_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('model', sa.String(length=32), nullable=False),
+    sa.Column('dim', sa.Integer(), nullable=False),
+    sa.Column('embedding', embedding_type, nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['linkedin_profiles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('profile_id')
+    )
+    op.create_index(op.f('ix_profile_embeddings_user_id'), 'profile_embeddings', ['user_id'], unique=False)
+    if postgres:
+        op.execute(
+            "CREATE INDEX ix_profile_embeddings_embedding_hnsw ON profile_embeddings "
+            "USING hnsw (embedding vector_cosine_ops)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_profile_embeddings_embedding_hnsw")
+    op.drop_index(op.f('ix_profile_embeddings_user_id'), table_name='profile_embeddings')
+    op.drop_table('profile_embeddings')
@@ -0,0 +1,74 @@
+"""Analytics rollups
+
+Revision ID: a41d7c5e0b93
+Revises: 3c8e1f2a9d40
+Create Date: 2026-10-19 10:03:17.584102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7c5e0b93'
+down_revision: Union[str, None] = '3c8e1f2a9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rollups for profiles analyzed before rollups existed, with the buckets
+# services.analytics.record_profile_analysis writes: one analysis per profile
+# row, on the day it was last analyzed. Message types were not stored yet, so
+# that metric starts empty.
+BACKFILL_ROLLUPS_SQL = """
+    WITH analyses AS (
+        SELECT
+            user_id,
+            COALESCE(engagement_score, 0) AS score,
+            COALESCE(last_analyzed, created_at) AS analyzed_at,
+            profile_data::jsonb AS data
+        FROM linkedin_profiles
+        WHERE user_id IS NOT NULL
+    ),
+    buckets AS (
+        SELECT user_id, 'engagement_score' AS metric,
+            '0.' || LEAST(GREATEST(floor(score * 10)::int, 0), 9) AS bucket, score, analyzed_at
+        FROM analyses
+        UNION ALL
+        SELECT user_id, 'analyzed_per_day', to_char(analyzed_at, 'YYYY-MM-DD'), score, analyzed_at
+        FROM analyses
+        WHERE analyzed_at IS NOT NULL
+        UNION ALL
+        SELECT user_id, 'industry',
+            CASE WHEN strpos(lower(COALESCE(data ->> 'title', '')), 'engineer') > 0 THEN 'tech' ELSE 'professional' END,
+            score, analyzed_at
+        FROM analyses
+        UNION ALL
+        SELECT user_id, 'company', data -> 'experience' -> 0 ->> 'company', score, analyzed_at
+        FROM analyses
+        WHERE COALESCE(data -> 'experience' -> 0 ->> 'company', '') <> ''
+    )
+    INSERT INTO analytics_rollups (user_id, metric, bucket, count, value_sum, updated_at)
+    SELECT user_id, metric, bucket, count(*), sum(score), COALESCE(max(analyzed_at), timezone('utc', now()))
+    FROM buckets
+    GROUP BY user_id, metric, bucket
+"""
+
+
+def upgrade() -> None:
+    op.create_table('analytics_rollups',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('metric', sa.String(length=32), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('value_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'metric', 'bucket')
+    )
+    op.execute(BACKFILL_ROLLUPS_SQL)
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_rollups')
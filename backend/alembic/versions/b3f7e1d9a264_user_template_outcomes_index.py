@@ -0,0 +1,40 @@
+"""Per-user template outcome index
+
+Revision ID: b3f7e1d9a264
+Revises: 8e4d2a6c1f57
+Create Date: 2026-10-19 17:48:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7e1d9a264'
+down_revision: Union[str, None] = '8e4d2a6c1f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_generated_messages_template_outcomes', table_name='generated_messages')
+    op.create_index(
+        'ix_generated_messages_user_template_outcomes',
+        'generated_messages',
+        ['user_id', 'message_type', 'industry', 'template_id', 'outcome'],
+        unique=False,
+        postgresql_where=sa.text('outcome IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generated_messages_user_template_outcomes', table_name='generated_messages')
+    op.create_index(
+        'ix_generated_messages_template_outcomes',
+        'generated_messages',
+        ['message_type', 'industry', 'template_id', 'outcome'],
+        unique=False,
+        postgresql_where=sa.text('outcome IS NOT NULL')
+    )
@@ -0,0 +1,35 @@
+"""Drop the profile embeddings HNSW index
+
+Revision ID: c9d4e2b7a815
+Revises: b3f7e1d9a264
+Create Date: 2026-10-19 18:32:40.118527
+
+Profiles analyzed before embeddings existed have none yet. Migrations do not
+run application code, so embed them after upgrading with
+`python backfill_embeddings.py` from backend/ (scripts/start_dev.sh does).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d4e2b7a815'
+down_revision: Union[str, None] = 'b3f7e1d9a264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Similar-profile search is an exact scan of one user's rows, which the
+    # HNSW index cannot serve; it only slowed down every embedding write
+    op.execute("DROP INDEX IF EXISTS ix_profile_embeddings_embedding_hnsw")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_profile_embeddings_embedding_hnsw ON profile_embeddings "
+            "USING hnsw (embedding vector_cosine_ops)"
+        )
@@ -0,0 +1,54 @@
+"""Generated messages
+
+Revision ID: d2b6f09e7c15
+Revises: a41d7c5e0b93
+Create Date: 2026-10-19 11:26:52.903318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b6f09e7c15'
+down_revision: Union[str, None] = 'a41d7c5e0b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('generated_messages',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('profile_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('message_type', sa.String(length=32), nullable=False),
+    sa.Column('industry', sa.String(length=64), nullable=False),
+    sa.Column('template_id', sa.SmallInteger(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('content_hash', sa.String(length=16), nullable=False),
+    sa.Column('tone', sa.String(length=32), nullable=True),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('is_selected', sa.Boolean(), nullable=False),
+    sa.Column('outcome', sa.String(length=16), nullable=True),
+    sa.Column('outcome_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['linkedin_profiles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_generated_messages_profile_id', 'generated_messages', ['profile_id'], unique=False)
+    op.create_index(
+        'ix_generated_messages_template_outcomes',
+        'generated_messages',
+        ['message_type', 'industry', 'template_id', 'outcome'],
+        unique=False,
+        postgresql_where=sa.text('outcome IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generated_messages_template_outcomes', table_name='generated_messages')
+    op.drop_index('ix_generated_messages_profile_id', table_name='generated_messages')
+    op.drop_table('generated_messages')
@@ -1,75 +1,310 @@
 # backend/api/agents.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import os
+import threading
+import base64
+import hashlib
+import orjson
+from uuid import UUID
+from datetime import datetime
 
 from models.base import get_db
 from models.user import User
 from models.profile import LinkedInProfile
-from agents.orchestrator import LinkedIntelligenceOrchestrator
-from main import get_current_user
+from agents.base import MessageVariant
+from agents.profile_cache import normalize_profile_url
+from agents.profile_fields import extract_industry
+from services.search import get_search_index
+from services.vector_index import get_vector_index
+from services.analytics import record_profile_analysis
+from services import messages as message_store
+from services.bandit_store import BanditSnapshotStore
+from services.singleflight import SingleFlight
+from schemas.agents import (
+    AnalyzeProfileRequest,
+    AnalyzeProfileResponse,
+    ProfileMessagesResponse,
+    StoredMessageResponse
+)
+from api.deps import get_current_read_user, get_current_user, get_read_db
+from api.fields import FieldTree, field_selection, select_fields
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
-# Initialize orchestrator
-orchestrator = LinkedIntelligenceOrchestrator()
+# The orchestrator (langgraph and, later, LLM clients) is built on first use
+# or pre-warmed from the app lifespan, never at import time
+_orchestrator = None
+_bandit_store = None
+_orchestrator_lock = threading.Lock()
 
-@router.post("/analyze-profile")
+def get_orchestrator():
+    """Return this worker's orchestrator, building it once"""
+    global _orchestrator, _bandit_store
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                from agents.orchestrator import LinkedIntelligenceOrchestrator
+                orchestrator = LinkedIntelligenceOrchestrator()
+                _bandit_store = BanditSnapshotStore(orchestrator.personalization_agent.selector)
+                _orchestrator = orchestrator
+    return _orchestrator
+
+def get_bandit_store() -> BanditSnapshotStore:
+    get_orchestrator()
+    return _bandit_store
+
+# Concurrent analyses of the same profile share one workflow run; the result
+# only needs to outlive the wait of followers on other workers
+_analysis_flight = SingleFlight(
+    "analysis",
+    result_ttl=float(os.getenv("SINGLEFLIGHT_RESULT_TTL_SECONDS", "10"))
+)
+
+# Idempotency-Key responses are replayed to retries for a day by default
+_idempotency_flight = SingleFlight(
+    "idempotency",
+    result_ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+    replay=True
+)
+
+def _encode_bytes(value: Any) -> str:
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _encode_workflow_result(result: Dict[str, Any]) -> bytes:
+    """orjson.dumps for a workflow result; the float32 embedding travels as base64"""
+    return orjson.dumps(result, default=_encode_bytes)
+
+def _decode_workflow_result(data: bytes) -> Dict[str, Any]:
+    """Inverse of _encode_workflow_result, restoring MessageVariant objects and the embedding"""
+    result = orjson.loads(data)
+    if result.get("profile_embedding"):
+        result["profile_embedding"] = base64.b64decode(result["profile_embedding"])
+    result["personalized_messages"] = [
+        MessageVariant(**message) for message in result.get("personalized_messages") or []
+    ]
+    result["selected_messages"] = {
+        message_type: MessageVariant(**message)
+        for message_type, message in (result.get("selected_messages") or {}).items()
+    }
+    if result.get("selected_message"):
+        result["selected_message"] = MessageVariant(**result["selected_message"])
+    return result
+
+async def _run_workflow(
+    user_id: str,
+    profile_url: str,
+    message_type: str,
+    message_types: List[str],
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """Run the orchestrator, coalescing concurrent requests for the same profile and types"""
+    # A refresh never joins a run that may be serving a cached profile
+    key = "|".join([
+        normalize_profile_url(profile_url),
+        message_type,
+        *sorted(set(message_types)),
+        *(["refresh"] if refresh else [])
+    ])
+    
+    result, shared = await _analysis_flight.do(
+        key,
+        lambda: get_orchestrator().process_profile(
+            user_id=user_id,
+            profile_url=profile_url,
+            message_type=message_type,
+            message_types=message_types,
+            refresh=refresh
+        ),
+        encode=_encode_workflow_result,
+        decode=_decode_workflow_result
+    )
+    
+    if shared:
+        metadata = {**(result.get("metadata") or {}), "coalesced": True}
+        if result.get("user_id") != user_id:
+            # Another user's workflow; its checkpoint thread is not resumable from here
+            metadata.pop("workflow_id", None)
+        result = {**result, "metadata": metadata}
+    
+    return result
+
+def _raise_if_failed(result: Dict[str, Any]) -> None:
+    """Refuse to save a run that ended in the error handler
+
+    Nothing is written, so resuming the workflow later saves the analysis once.
+    """
+    if result.get("errors"):
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "message": "Agent processing failed",
+                "workflow_id": (result.get("metadata") or {}).get("workflow_id"),
+                "errors": result["errors"]
+            }
+        )
+
+def _persist_result(
+    db: Session,
+    current_user: User,
+    profile_url: str,
+    message_type: str,
+    result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Save a finished workflow's results and build the API response"""
+    
+    # Save results to database
+    analyzed_at = datetime.utcnow()
+    db_profile = LinkedInProfile(
+        user_id=current_user.id,
+        linkedin_url=profile_url,
+        profile_data=result.get("profile_data", {}),
+        ai_insights=result.get("ai_insights", {}),
+        engagement_score=result.get("engagement_score", 0.0),
+        last_analyzed=analyzed_at
+    )
+    
+    db.add(db_profile)
+    db.flush()
+    
+    # Keep the search and vector indexes and analytics rollups in step with the profile write
+    get_search_index().index_profile(db, db_profile)
+    if result.get("profile_embedding"):
+        get_vector_index().index_profile(db, db_profile.id, current_user.id, result["profile_embedding"])
+    record_profile_analysis(
+        db,
+        user_id=current_user.id,
+        profile_data=db_profile.profile_data,
+        engagement_score=db_profile.engagement_score,
+        message_types=result.get("message_types") or [message_type],
+        analyzed_at=analyzed_at
+    )
+    message_ids = message_store.store_generated_messages(
+        db,
+        profile_id=db_profile.id,
+        user_id=current_user.id,
+        industry=extract_industry(db_profile.profile_data or {}),
+        messages=result.get("personalized_messages") or [],
+        selected_messages=list((result.get("selected_messages") or {}).values())
+    )
+    db.commit()
+    db.refresh(db_profile)
+    
+    return {
+        "status": "success",
+        "profile_id": str(db_profile.id),
+        "analysis": {
+            "profile_data": result.get("profile_data"),
+            "ai_insights": result.get("ai_insights"),
+            "engagement_score": result.get("engagement_score"),
+            "personalized_messages": result.get("personalized_messages"),
+            "selected_message": result.get("selected_message"),
+            "selected_messages": result.get("selected_messages")
+        },
+        "message_ids": message_ids,
+        "workflow_metadata": result.get("metadata"),
+        "errors": result.get("errors", [])
+    }
+
+@router.post("/analyze-profile", response_model=AnalyzeProfileResponse, response_model_exclude_unset=True)
 async def analyze_profile(
-    profile_data: Dict[str, Any],
+    profile_data: AnalyzeProfileRequest,
+    response: Response,
+    fields: Optional[FieldTree] = Depends(field_selection(AnalyzeProfileResponse)),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Analyze a LinkedIn profile using our agent system"""
+    """Analyze a LinkedIn profile using our agent system
+    
+    With an Idempotency-Key header, retries of the request return the stored
+    response instead of analyzing and saving the profile again; reusing the key
+    for a different request is rejected with 422. Set "refresh" to re-analyze
+    from a freshly fetched profile rather than a cached one.
+    """
     
-    profile_url = profile_data.get("profile_url")
-    message_type = profile_data.get("message_type", "connection_request")
+    profile_url = profile_data.profile_url
+    message_type = profile_data.message_type
+    message_types = profile_data.message_types
+    refresh = profile_data.refresh
     
     if not profile_url:
         raise HTTPException(status_code=400, detail="Profile URL is required")
     
-    try:
-        # Process through agent workflow
-        result = await orchestrator.process_profile(
-            user_id=str(current_user.id),
-            profile_url=profile_url,
-            message_type=message_type
-        )
+    async def analyze() -> Dict[str, Any]:
+        try:
+            get_bandit_store().ensure_loaded(db)
+            
+            # Process through agent workflow
+            result = await _run_workflow(str(current_user.id), profile_url, message_type, message_types, refresh)
+            _raise_if_failed(result)
+            
+            return _persist_result(db, current_user, profile_url, message_type, result)
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Agent processing failed: {str(e)}")
+    
+    if idempotency_key:
+        # The key is only replayed for the request it was first used with
+        request_hash = hashlib.sha256(profile_data.model_dump_json().encode()).hexdigest()
         
-        # Save results to database
-        db_profile = LinkedInProfile(
-            user_id=current_user.id,
-            linkedin_url=profile_url,
-            profile_data=result.get("profile_data", {}),
-            ai_insights=result.get("ai_insights", {}),
-            engagement_score=result.get("engagement_score", 0.0)
-        )
+        async def analyze_once() -> Dict[str, Any]:
+            return {"request_hash": request_hash, "response": await analyze()}
         
-        db.add(db_profile)
-        db.commit()
-        db.refresh(db_profile)
+        stored, replayed = await _idempotency_flight.do(f"{current_user.id}:{idempotency_key}", analyze_once)
+        if stored["request_hash"] != request_hash:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        payload = stored["response"]
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+    else:
+        payload = await analyze()
+    
+    return select_fields(payload, fields, AnalyzeProfileResponse)
+
+@router.post("/workflows/{workflow_id}/resume", response_model=AnalyzeProfileResponse, response_model_exclude_unset=True)
+async def resume_workflow(
+    workflow_id: str,
+    fields: Optional[FieldTree] = Depends(field_selection(AnalyzeProfileResponse)),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Resume a failed or interrupted workflow from its last checkpoint"""
+    
+    orchestrator = get_orchestrator()
+    state = orchestrator.get_workflow(workflow_id)
+    if state is None or state.get("user_id") != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    if state.get("current_step") == "personalization_complete" and not state.get("errors"):
+        raise HTTPException(status_code=409, detail="Workflow already completed")
+    
+    try:
+        get_bandit_store().ensure_loaded(db)
         
-        return {
-            "status": "success",
-            "profile_id": str(db_profile.id),
-            "analysis": {
-                "profile_data": result.get("profile_data"),
-                "ai_insights": result.get("ai_insights"),
-                "engagement_score": result.get("engagement_score"),
-                "personalized_messages": result.get("personalized_messages"),
-                "selected_message": result.get("selected_message")
-            },
-            "workflow_metadata": result.get("metadata"),
-            "errors": result.get("errors", [])
-        }
+        result = await orchestrator.resume_workflow(workflow_id)
+        _raise_if_failed(result)
         
+        response = _persist_result(db, current_user, result["profile_url"], result["message_type"], result)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Agent processing failed: {str(e)}")
+    
+    return select_fields(response, fields, AnalyzeProfileResponse)
 
 @router.get("/profiles")
 async def get_user_profiles(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all analyzed profiles for the current user"""
     
@@ -90,5 +325,65 @@ async def get_user_profiles(
         ]
     }
 
+@router.get("/profiles/{profile_id}/messages", response_model=ProfileMessagesResponse, response_model_exclude_unset=True)
+async def get_profile_messages(
+    profile_id: UUID,
+    message_type: Optional[str] = None,
+    fields: Optional[FieldTree] = Depends(field_selection(ProfileMessagesResponse)),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Re-serve stored messages for a profile without rerunning the workflow"""
+    
+    messages = message_store.get_profile_messages(
+        db, profile_id, current_user.id, message_type=message_type
+    )
+    if not messages:
+        raise HTTPException(status_code=404, detail="No messages stored for this profile")
+    
+    return select_fields({
+        "profile_id": str(profile_id),
+        "selected_message": message_store.serialize_message(messages[0]) if messages[0].is_selected else None,
+        "messages": [message_store.serialize_message(message) for message in messages]
+    }, fields, ProfileMessagesResponse)
+
+@router.post("/messages/{message_id}/outcome", response_model=StoredMessageResponse)
+async def record_message_outcome(
+    message_id: int,
+    outcome_data: Dict[str, Any],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Record what happened after a generated message was used"""
+    
+    outcome = outcome_data.get("outcome")
+    if outcome not in message_store.OUTCOMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Outcome must be one of: {', '.join(message_store.OUTCOMES)}"
+        )
+    
+    bandit_store = get_bandit_store()
+    bandit_store.ensure_loaded(db)
+    
+    message = message_store.get_message(db, message_id, current_user.id)
+    if message is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    
+    previous_outcome = message.outcome
+    message_store.record_outcome(message, outcome)
+    db.commit()
+    
+    # Feed the reward back into template selection
+    bandit_store.record_outcome(
+        message.message_type,
+        message.template_id,
+        message.industry,
+        outcome,
+        previous_outcome
+    )
+    
+    return message_store.serialize_message(message)
+
 # Add router to main app
 # In main.py, add: app.include_router(agents.router)
\ No newline at end of file
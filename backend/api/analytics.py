@@ -0,0 +1,83 @@
+# backend/api/analytics.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from models.user import User
+from services import analytics
+from services import messages as message_store
+from api.deps import get_current_read_user, get_read_db
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# All endpoints read pre-aggregated rollups; none of them scan linkedin_profiles,
+# and all of them may be served by a read replica
+
+@router.get("/engagement-distribution")
+async def get_engagement_distribution(
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Histogram of engagement scores across analyzed profiles"""
+    return {"buckets": analytics.get_engagement_distribution(db, current_user.id)}
+
+@router.get("/daily")
+async def get_daily_analyses(
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Profiles analyzed per day"""
+    return {"days": analytics.get_daily_analyses(db, current_user.id, days)}
+
+@router.get("/top-companies")
+async def get_top_companies(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Most frequently analyzed companies"""
+    return {"companies": analytics.get_top_buckets(db, current_user.id, analytics.COMPANY, limit)}
+
+@router.get("/top-industries")
+async def get_top_industries(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Most frequently analyzed industries"""
+    return {"industries": analytics.get_top_buckets(db, current_user.id, analytics.INDUSTRY, limit)}
+
+@router.get("/message-types")
+async def get_message_type_usage(
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Usage count per requested message type"""
+    return {"message_types": analytics.get_top_buckets(db, current_user.id, analytics.MESSAGE_TYPE, 100)}
+
+@router.get("/overview")
+async def get_overview(
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """All dashboard aggregates in one call"""
+    return {
+        "engagement_distribution": analytics.get_engagement_distribution(db, current_user.id),
+        "daily": analytics.get_daily_analyses(db, current_user.id, days),
+        "top_companies": analytics.get_top_buckets(db, current_user.id, analytics.COMPANY, 10),
+        "top_industries": analytics.get_top_buckets(db, current_user.id, analytics.INDUSTRY, 10),
+        "message_types": analytics.get_top_buckets(db, current_user.id, analytics.MESSAGE_TYPE, 100)
+    }
+
+@router.get("/templates")
+async def get_best_templates(
+    message_type: str = Query("connection_request"),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Best-performing template per industry from recorded message outcomes"""
+    return {
+        "message_type": message_type,
+        "templates": message_store.best_templates_by_industry(db, current_user.id, message_type)
+    }
@@ -0,0 +1,81 @@
+# backend/api/deps.py
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from models.base import get_db, session_router
+from models.user import User
+from services.auth import verify_token, verify_token_claims
+
+security = HTTPBearer()
+
+# Authentication dependency
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    token = credentials.credentials
+    email = verify_token(token)
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        raise _user_not_found()
+    # Lets the session router give this user read-your-writes after a commit
+    db.info["user_id"] = user.id
+    return user
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="User not found"
+    )
+
+def _lookup_user_id(email: str) -> Optional[UUID]:
+    """User id for an email, from a replica when possible and the primary for brand-new users"""
+    for open_session in (session_router.read_session, session_router.primary):
+        with open_session() as db:
+            user_id = db.query(User.id).filter(User.email == email).scalar()
+        if user_id is not None:
+            return user_id
+    return None
+
+def _token_user_id(claims: dict) -> Optional[UUID]:
+    """User id from the token's "uid" claim; tokens issued without one are looked up by email"""
+    if "uid" not in claims:
+        return _lookup_user_id(claims["sub"])
+    try:
+        return UUID(claims["uid"])
+    except (TypeError, ValueError):
+        return None
+
+def get_read_db(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Session for read-only endpoints; may be served by a read replica
+    
+    Authenticates without holding a primary session open for the request.
+    Deleted users are rejected by get_current_read_user, which loads by id.
+    """
+    user_id = _token_user_id(verify_token_claims(credentials.credentials))
+    if user_id is None:
+        raise _user_not_found()
+    
+    db = session_router.read_session(user_id)
+    db.info["user_id"] = user_id
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_current_read_user(db: Session = Depends(get_read_db)):
+    """The authenticated user, loaded through the read session of get_read_db"""
+    user = db.get(User, db.info["user_id"])
+    if user is None:
+        # A replica that has not caught up with a new account yet
+        with session_router.primary() as primary:
+            user = primary.get(User, db.info["user_id"])
+            if user is not None:
+                primary.expunge(user)
+    if user is None:
+        raise _user_not_found()
+    return user
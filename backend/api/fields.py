@@ -0,0 +1,110 @@
+# backend/api/fields.py
+import dataclasses
+import typing
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+FieldTree = Dict[str, Optional["FieldTree"]]
+
+def _parse(fields: Optional[str]) -> Optional[FieldTree]:
+    """Parse ?fields= into a tree of selected field names; None selects everything"""
+    if not fields:
+        return None
+
+    tree: FieldTree = {}
+    for path in fields.split(","):
+        parts = [part.strip() for part in path.split(".") if part.strip()]
+        node = tree
+        for index, part in enumerate(parts):
+            if index == len(parts) - 1:
+                node[part] = None  # Leaf: select the whole value
+            elif node.get(part, {}) is not None:
+                node = node.setdefault(part, {})
+            else:
+                break  # A parent is already selected in full
+    return tree or None
+
+def _nested_model(model: Type[BaseModel], name: str) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """The BaseModel behind a field, and whether it is held in a Dict[str, Model]"""
+    annotation = model.model_fields[name].annotation
+    if typing.get_origin(annotation) is typing.Union:
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+
+    is_mapping = typing.get_origin(annotation) is dict
+    pending = [annotation]
+    while pending:
+        candidate = pending.pop()
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate, is_mapping
+        pending.extend(typing.get_args(candidate))
+    return None, is_mapping
+
+def _validate(tree: FieldTree, model: Type[BaseModel], prefix: str = "") -> None:
+    for name, subtree in tree.items():
+        if name not in model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {prefix}{name}")
+        if subtree is None:
+            continue
+
+        nested, _ = _nested_model(model, name)
+        if nested is None:
+            raise HTTPException(status_code=400, detail=f"Field has no subfields: {prefix}{name}")
+        _validate(subtree, nested, f"{prefix}{name}.")
+
+def field_selection(model: Type[BaseModel]) -> Callable[..., Optional[FieldTree]]:
+    """Dependency parsing ?fields= and rejecting names the response model lacks
+
+    Validation happens before the endpoint runs, so a typo fails fast
+    instead of after the work is done.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated fields to return, dotted for nested ones (e.g. profile_id,analysis.engagement_score)"
+        )
+    ) -> Optional[FieldTree]:
+        tree = _parse(fields)
+        if tree is not None:
+            _validate(tree, model)
+        return tree
+
+    return dependency
+
+def _select(value: Any, tree: FieldTree, model: Type[BaseModel]) -> Any:
+    if isinstance(value, list):
+        return [_select(item, tree, model) for item in value]
+    if dataclasses.is_dataclass(value):
+        value = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if not isinstance(value, dict):
+        return value
+
+    selected = {}
+    for name, subtree in tree.items():
+        if name not in value:
+            continue
+
+        if subtree is None:
+            selected[name] = value[name]
+            continue
+
+        nested, is_mapping = _nested_model(model, name)
+        child = value[name]
+        if is_mapping and isinstance(child, dict):
+            selected[name] = {
+                key: _select(item, subtree, nested)
+                for key, item in child.items()
+            }
+        else:
+            selected[name] = _select(child, subtree, nested)
+    return selected
+
+def select_fields(payload: Dict[str, Any], fields: Optional[FieldTree], model: Type[BaseModel]) -> Dict[str, Any]:
+    """Keep only the selected fields of a response payload
+
+    Pair with response_model_exclude_unset=True: unselected fields are never
+    set on the response model, so they are neither validated nor serialized.
+    """
+    if fields is None:
+        return payload
+    return _select(payload, fields, model)
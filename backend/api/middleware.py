@@ -0,0 +1,117 @@
+# backend/api/middleware.py
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import orjson
+
+from services.admission import AdmissionController, retry_after_header
+from services.auth import decode_token_claims
+
+class FirstRequestTimer:
+    """Pure ASGI middleware recording the time from process start to the first served request"""
+    
+    def __init__(self, app, metrics: dict, started_at: float):
+        self.app = app
+        self.metrics = metrics
+        self.started_at = started_at
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.metrics.get("first_request_ms") is not None:
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.metrics.get("first_request_ms") is None:
+                elapsed_ms = round((time.perf_counter() - self.started_at) * 1000, 1)
+                self.metrics["first_request_ms"] = elapsed_ms
+                print(f"Cold start to first served request: {elapsed_ms} ms")
+
+def is_workflow_request(method: str, path: str) -> bool:
+    """Requests that run the agent workflow and count against concurrency caps"""
+    if method != "POST":
+        return False
+    return path == "/api/agents/analyze-profile" or (
+        path.startswith("/api/agents/workflows/") and path.endswith("/resume")
+    )
+
+class AdmissionControl:
+    """Pure ASGI middleware enforcing per-tier rate limits and workflow concurrency
+    
+    The caller and tier come from the bearer token's claims (cached per token),
+    so admission costs one Redis script call and no database query. Requests
+    without a valid token pass through and are rejected by the route.
+    """
+    
+    def __init__(self, app, controller: Optional[AdmissionController] = None, max_cached_tokens: int = 10000):
+        self.app = app
+        self.controller = controller or AdmissionController()
+        self.max_cached_tokens = max_cached_tokens
+        self._claims: "OrderedDict[bytes, Tuple[str, Optional[str], float]]" = OrderedDict()
+    
+    def _identity(self, scope) -> Optional[Tuple[str, Optional[str]]]:
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+                break
+        if not authorization or authorization[:7].lower() != b"bearer ":
+            return None
+        
+        token = authorization[7:]
+        cached = self._claims.get(token)
+        if cached is None:
+            claims = decode_token_claims(token.decode("latin-1"))
+            if not claims or not claims.get("sub"):
+                return None
+            cached = (claims["sub"], claims.get("tier"), float(claims.get("exp", "inf")))
+            self._claims[token] = cached
+            if len(self._claims) > self.max_cached_tokens:
+                self._claims.popitem(last=False)
+        
+        subject, tier, expires_at = cached
+        if expires_at < time.time():
+            self._claims.pop(token, None)
+            return None
+        return subject, tier
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        
+        identity = self._identity(scope)
+        if identity is None:
+            await self.app(scope, receive, send)
+            return
+        
+        subject, tier = identity
+        workflow = is_workflow_request(scope["method"], scope["path"])
+        request_id = uuid.uuid4().hex
+        decision = await self.controller.acquire(subject, tier, workflow, request_id)
+        
+        if not decision.allowed:
+            body = orjson.dumps({"detail": "Too many requests", "reason": decision.reason})
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", retry_after_header(decision).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        
+        if not workflow:
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.controller.release(subject, request_id)
@@ -1,22 +1,49 @@
 # backend/api/profiles.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
+from datetime import datetime
 
 from models.base import get_db
 from models.user import User
 from models.profile import LinkedInProfile
-from main import get_current_user
+from services.search import get_search_index
+from services.vector_index import get_vector_index
+from services import export as profile_export
+from schemas.profile import (
+    ProfileDetailResponse,
+    ProfileSearchResponse,
+    ProfileSummaryResponse,
+    SimilarProfilesResponse
+)
+from api.deps import get_current_read_user, get_current_user, get_read_db
+from api.fields import FieldTree, field_selection, select_fields
 
 router = APIRouter(prefix="/api/profiles", tags=["profiles"])
 
-@router.get("/", response_model=List[dict])
+def _profile_summary(profile: LinkedInProfile) -> dict:
+    """Serialize a profile for listing and search results"""
+    return {
+        "id": str(profile.id),
+        "linkedin_url": profile.linkedin_url,
+        "engagement_score": profile.engagement_score,
+        "last_analyzed": profile.last_analyzed,
+        "created_at": profile.created_at,
+        "profile_summary": {
+            "name": profile.profile_data.get("name", "Unknown"),
+            "title": profile.profile_data.get("title", ""),
+            "company": profile.profile_data.get("experience", [{}])[0].get("company", "") if profile.profile_data.get("experience") else ""
+        }
+    }
+
+@router.get("/", response_model=List[ProfileSummaryResponse])
 async def get_user_profiles(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all analyzed profiles for the current user with pagination"""
     
@@ -24,27 +51,74 @@ async def get_user_profiles(
         LinkedInProfile.user_id == current_user.id
     ).offset(skip).limit(limit).all()
     
-    return [
-        {
-            "id": str(profile.id),
-            "linkedin_url": profile.linkedin_url,
-            "engagement_score": profile.engagement_score,
-            "last_analyzed": profile.last_analyzed,
-            "created_at": profile.created_at,
-            "profile_summary": {
-                "name": profile.profile_data.get("name", "Unknown"),
-                "title": profile.profile_data.get("title", ""),
-                "company": profile.profile_data.get("experience", [{}])[0].get("company", "") if profile.profile_data.get("experience") else ""
-            }
+    return [_profile_summary(profile) for profile in profiles]
+
+@router.get("/search", response_model=ProfileSearchResponse)
+async def search_profiles(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Ranked full-text search over the current user's analyzed profiles"""
+    
+    hits = get_search_index().search(db, current_user.id, q, skip=skip, limit=limit)
+    if not hits:
+        return {"query": q, "results": []}
+    
+    profiles = db.query(LinkedInProfile).filter(
+        LinkedInProfile.id.in_([profile_id for profile_id, _ in hits]),
+        LinkedInProfile.user_id == current_user.id
+    ).all()
+    profiles_by_id = {profile.id: profile for profile in profiles}
+    
+    return {
+        "query": q,
+        "results": [
+            {**_profile_summary(profiles_by_id[profile_id]), "rank": rank}
+            for profile_id, rank in hits
+            if profile_id in profiles_by_id
+        ]
+    }
+
+@router.get("/export")
+async def export_profiles(
+    format: Literal["csv", "ndjson", "parquet"] = Query("ndjson"),
+    since: Optional[datetime] = Query(None, description="Only profiles with since_field after this time"),
+    since_field: Literal["last_analyzed", "created_at"] = Query("last_analyzed"),
+    current_user: User = Depends(get_current_read_user)
+):
+    """Stream all of the user's analyzed profiles as CSV, NDJSON or Parquet
+    
+    Rows come from a server-side cursor and are encoded batch by batch, so
+    memory stays flat however many profiles there are. Pass the returned
+    X-Export-Until header as since= on the next call for an incremental export;
+    profiles analyzed in the last few seconds are left for that next export.
+    """
+    
+    if format == "parquet" and not profile_export.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow on the server")
+    
+    until = profile_export.export_watermark()
+    media_type, extension = profile_export.EXPORT_FORMATS[format]
+    batches = profile_export.iter_profile_batches(current_user.id, since, since_field, until)
+    
+    return StreamingResponse(
+        profile_export.ENCODERS[format](batches),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="profiles-{until:%Y%m%dT%H%M%S}.{extension}"',
+            "X-Export-Until": until.isoformat()
         }
-        for profile in profiles
-    ]
+    )
 
-@router.get("/{profile_id}")
+@router.get("/{profile_id}", response_model=ProfileDetailResponse, response_model_exclude_unset=True)
 async def get_profile_details(
     profile_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[FieldTree] = Depends(field_selection(ProfileDetailResponse)),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get detailed information about a specific profile"""
     
@@ -56,7 +130,7 @@ async def get_profile_details(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    return {
+    return select_fields({
         "id": str(profile.id),
         "linkedin_url": profile.linkedin_url,
         "profile_data": profile.profile_data,
@@ -64,6 +138,45 @@ async def get_profile_details(
         "engagement_score": profile.engagement_score,
         "last_analyzed": profile.last_analyzed,
         "created_at": profile.created_at
+    }, fields, ProfileDetailResponse)
+
+@router.get("/{profile_id}/similar", response_model=SimilarProfilesResponse)
+async def get_similar_profiles(
+    profile_id: UUID,
+    k: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """Find the current user's analyzed profiles most similar to this one
+    
+    Only profiles with a positive similarity are returned, so there may be fewer than k.
+    """
+    
+    exists = db.query(LinkedInProfile.id).filter(
+        LinkedInProfile.id == profile_id,
+        LinkedInProfile.user_id == current_user.id
+    ).first()
+    
+    if not exists:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    hits = get_vector_index().similar(db, current_user.id, profile_id, k=k)
+    if not hits:
+        return {"profile_id": str(profile_id), "results": []}
+    
+    profiles = db.query(LinkedInProfile).filter(
+        LinkedInProfile.id.in_([hit_id for hit_id, _ in hits]),
+        LinkedInProfile.user_id == current_user.id
+    ).all()
+    profiles_by_id = {profile.id: profile for profile in profiles}
+    
+    return {
+        "profile_id": str(profile_id),
+        "results": [
+            {**_profile_summary(profiles_by_id[hit_id]), "similarity": similarity}
+            for hit_id, similarity in hits
+            if hit_id in profiles_by_id
+        ]
     }
 
 @router.delete("/{profile_id}")
@@ -82,6 +195,8 @@ async def delete_profile(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    get_search_index().remove_profile(db, profile.id)
+    get_vector_index().remove_profile(db, profile.id)
     db.delete(profile)
     db.commit()
     
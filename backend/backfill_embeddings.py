@@ -0,0 +1,18 @@
+# backend/backfill_embeddings.py
+"""Embed profiles analyzed before profile embeddings existed
+
+Usage (from backend/, after `alembic upgrade head`): python backfill_embeddings.py
+Safe to re-run; profiles that already have an embedding are skipped.
+"""
+from models.base import SessionLocal
+from services.vector_index import backfill_embeddings
+
+def main() -> int:
+    with SessionLocal() as db:
+        embedded = backfill_embeddings(db)
+        db.commit()
+    print(f"Embedded {embedded} profiles")
+    return embedded
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,81 @@
 # backend/main.py (Updated Complete Version)
+import time
+
+PROCESS_STARTED_AT = time.perf_counter()
+
 from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-import uvicorn
+from contextlib import asynccontextmanager
 import os
 from datetime import timedelta
 
-from models.base import get_db, engine, Base
+from models.base import get_db
 from models.user import User
 from models.profile import LinkedInProfile
 from schemas.user import UserCreate, UserResponse, Token
 from services.auth import (
     get_password_hash, 
     verify_password, 
-    create_access_token, 
-    verify_token
+    create_access_token
 )
+from api.deps import get_current_user
+from api.middleware import AdmissionControl, FirstRequestTimer
 
 # Import API routers
-from api.agents import router as agents_router
+from api.agents import router as agents_router, get_orchestrator
 from api.profiles import router as profiles_router
 from api.analytics import router as analytics_router
 
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
+# Schema changes are applied by Alembic (alembic upgrade head), never on import
+PREWARM_AGENTS = os.getenv("PREWARM_AGENTS", "true").lower() == "true"
+
+# Responses smaller than this are sent uncompressed; gzip costs more than it saves on them
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+# Per-tier rate limits and workflow concurrency caps (services/admission.py)
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+
+startup_metrics = {
+    "import_ms": round((time.perf_counter() - PROCESS_STARTED_AT) * 1000, 1),
+    "lifespan_ms": None,
+    "ready_ms": None,
+    "first_request_ms": None
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup: pre-warm the agent graph before accepting traffic"""
+    lifespan_started_at = time.perf_counter()
+    
+    if PREWARM_AGENTS:
+        get_orchestrator()
+    
+    now = time.perf_counter()
+    startup_metrics["lifespan_ms"] = round((now - lifespan_started_at) * 1000, 1)
+    startup_metrics["ready_ms"] = round((now - PROCESS_STARTED_AT) * 1000, 1)
+    print(f"Startup complete: {startup_metrics}")
+    
+    yield
 
 app = FastAPI(
     title="LinkedIntelligence API",
     description="AI-powered LinkedIn automation and intelligence platform",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Added first so it runs inside CORS, and 429s still carry CORS headers
+if ADMISSION_CONTROL:
+    app.add_middleware(AdmissionControl)
+
 # CORS middleware - configure for production
 origins = [
     "http://localhost:3000",  # React dev server
@@ -49,22 +91,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-security = HTTPBearer()
-
-# Authentication dependency
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
-    email = verify_token(token)
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
+app.add_middleware(FirstRequestTimer, metrics=startup_metrics, started_at=PROCESS_STARTED_AT)
 
 # Include API routers
 app.include_router(agents_router)
@@ -80,11 +109,16 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/health/startup")
+async def startup_health_check():
+    """Cold-start timings for this worker"""
+    return startup_metrics
+
 @app.get("/health/db")
 async def database_health_check(db: Session = Depends(get_db)):
     try:
         # Test database connection
-        result = db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         raise HTTPException(
@@ -130,7 +164,7 @@ async def login(user: UserCreate, db: Session = Depends(get_db)):
     
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
-        data={"sub": db_user.email}, 
+        data={"sub": db_user.email, "uid": str(db_user.id), "tier": db_user.subscription_tier},
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -143,13 +177,18 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    return {
-        "detail": "Internal server error",
-        "status_code": 500,
-        "error_type": type(exc).__name__
-    }
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "detail": "Internal server error",
+            "status_code": 500,
+            "error_type": type(exc).__name__
+        }
+    )
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app", 
         host="0.0.0.0", 
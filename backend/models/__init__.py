@@ -2,5 +2,9 @@
 from .base import Base
 from .user import User
 from .profile import LinkedInProfile
+from .search import ProfileSearchDocument
+from .analytics import AnalyticsRollup
+from .message import GeneratedMessage
+from .embedding import ProfileEmbedding
 
-__all__ = ['Base', 'User', 'LinkedInProfile'] 
\ No newline at end of file
+__all__ = ['Base', 'User', 'LinkedInProfile', 'ProfileSearchDocument', 'AnalyticsRollup', 'GeneratedMessage', 'ProfileEmbedding'] 
\ No newline at end of file
@@ -0,0 +1,15 @@
+# backend/models/analytics.py
+from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, Uuid
+from datetime import datetime
+from .base import Base
+
+class AnalyticsRollup(Base):
+    """Pre-aggregated counters, one row per (user, metric, bucket)"""
+    __tablename__ = "analytics_rollups"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    metric = Column(String(32), primary_key=True)
+    bucket = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,21 +1,216 @@
 # backend/models/base.py
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, text, MetaData
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, Callable, Dict, List, Optional
+import itertools
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Comma-separated read replicas; empty means every read goes to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a user's own write, their reads stay on the primary this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DATABASE_READ_YOUR_WRITES_SECONDS", "5"))
+# Replicas further behind than this are skipped
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "2"))
+# How often each worker re-checks a replica's health and lag
+REPLICA_CHECK_SECONDS = float(os.getenv("DATABASE_REPLICA_CHECK_SECONDS", "5"))
+# Bounds the inline health probe so an unreachable replica cannot stall a request
+REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv("DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
+REPLICA_PROBE_TIMEOUT_MS = int(os.getenv("DATABASE_REPLICA_PROBE_TIMEOUT_MS", "500"))
 
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+STICKY_KEY_PREFIX = "linkedintelligence:db:wrote"
+
+# NULL when the standby is not streaming from the primary: received == replayed
+# then only means nothing new is arriving. While streaming, zero once everything
+# received is replayed, since an idle primary would otherwise look like lag.
+# Without pg_read_all_stats the receiver's status reads as NULL; a running
+# receiver then counts as streaming.
+PG_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status IS NULL OR status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def replica_lag_seconds(connection) -> float:
+    """Replication delay of the database behind connection; infinite when replication is broken"""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(f"SET LOCAL statement_timeout = {REPLICA_PROBE_TIMEOUT_MS}"))
+        lag = connection.execute(PG_REPLICA_LAG_SQL).scalar()
+        return float("inf") if lag is None else float(lag)
+    connection.execute(text("SELECT 1"))
+    return 0.0
+
+def replica_engine(url: str) -> Engine:
+    """Engine for a read replica with a bounded connect timeout"""
+    connect_args = {}
+    if make_url(url).get_backend_name() == "postgresql":
+        connect_args["connect_timeout"] = REPLICA_CONNECT_TIMEOUT_SECONDS
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
+class _Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.usable = False
+        self.checked_at = float("-inf")
+
+class SessionRouter:
+    """Route read-only sessions to replicas and everything else to the primary
+
+    Reads go to the primary instead when the user wrote within the
+    read-your-writes window, or when no replica is reachable and within
+    max_lag. Replica health is probed at most once per check interval.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replicas: List[Engine],
+        sticky_seconds: float = READ_YOUR_WRITES_SECONDS,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        check_seconds: float = REPLICA_CHECK_SECONDS,
+        redis: Optional[Callable[[], Any]] = None
+    ):
+        self.primary = primary
+        self.replicas = [_Replica(replica) for replica in replicas]
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._redis = redis  # Shares stickiness between workers when configured
+        self._writes: Dict[str, float] = {}  # user key -> monotonic time of last write
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._replica_error_handler(replica))
+
+        # Commits that wrote on behalf of a user start their read-your-writes window;
+        # the user is set in session.info["user_id"] by get_current_user
+        event.listen(primary, "do_orm_execute", self._track_statement_writes)
+        event.listen(primary, "after_flush", self._track_flush_writes)
+        event.listen(primary, "after_commit", self._note_committed_write)
+        event.listen(primary, "after_rollback", self._forget_rolled_back_write)
+
+    def note_write(self, user_key: Any) -> None:
+        """Pin the user's reads to the primary for the read-your-writes window"""
+        if not self.replicas or self.sticky_seconds <= 0:
+            return
+        key = str(user_key)
+        now = time.monotonic()
+        with self._lock:
+            self._writes[key] = now + self.sticky_seconds
+            if len(self._writes) > 10000:
+                self._writes = {k: until for k, until in self._writes.items() if until > now}
+
+        client = self._redis() if self._redis else None
+        if client is not None:
+            try:
+                client.set(f"{STICKY_KEY_PREFIX}:{key}", 1, px=int(self.sticky_seconds * 1000))
+            except Exception as e:
+                print(f"Could not share read-your-writes marker: {e}")
+
+    def _wrote_recently(self, key: str) -> bool:
+        if self._writes.get(key, 0) > time.monotonic():
+            return True
+
+        client = self._redis() if self._redis else None
+        if client is None:
+            return False
+        try:
+            return bool(client.exists(f"{STICKY_KEY_PREFIX}:{key}"))
+        except Exception:
+            return True  # Unknown, so stay on the safe side
+
+    def read_session(self, user_key: Any = None) -> Session:
+        """Session for read-only work; a replica when that is safe, otherwise the primary"""
+        if not self.replicas or (user_key is not None and self._wrote_recently(str(user_key))):
+            return self.primary()
+
+        replica = self._pick_replica()
+        if replica is None:
+            return self.primary()
+        session = replica.sessionmaker()
+        session.info["replica"] = True
+        return session
+
+    def _pick_replica(self) -> Optional[_Replica]:
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self._check(replica):
+                return replica
+        return None
+
+    def _check(self, replica: _Replica) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - replica.checked_at < self.check_seconds:
+                return replica.usable
+            replica.checked_at = now  # Other requests keep the last verdict meanwhile
+
+        try:
+            with replica.engine.connect() as connection:
+                lag = replica_lag_seconds(connection)
+        except Exception as e:
+            print(f"Read replica unavailable, reading from primary: {e}")
+            replica.usable = False
+            return False
+
+        replica.usable = lag <= self.max_lag_seconds
+        if not replica.usable:
+            print(f"Read replica {lag:.1f}s behind or not streaming, reading from primary")
+        return replica.usable
+
+    def _track_statement_writes(self, execute_state) -> None:
+        if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+            execute_state.session.info["wrote"] = True
+
+    def _track_flush_writes(self, session: Session, flush_context) -> None:
+        session.info["wrote"] = True
+
+    def _note_committed_write(self, session: Session) -> None:
+        if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+            self.note_write(session.info["user_id"])
+
+    def _forget_rolled_back_write(self, session: Session) -> None:
+        session.info.pop("wrote", None)
+
+    def _replica_error_handler(self, replica: _Replica):
+        def handle_error(context) -> None:
+            # Stop sending reads to a replica that dropped a connection until the next check
+            if context.is_disconnect:
+                replica.usable = False
+        return handle_error
+
+def _redis_client():
+    from services.redis_client import get_redis
+    return get_redis()
+
+session_router = SessionRouter(
+    SessionLocal,
+    [replica_engine(url) for url in DATABASE_REPLICA_URLS],
+    redis=_redis_client
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,49 @@
+# backend/models/embedding.py
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime, ForeignKey, Uuid
+from sqlalchemy.types import UserDefinedType
+from datetime import datetime
+import struct
+from agents.embedding import EMBEDDING_DIM
+from .base import Base
+
+class Vector(UserDefinedType):
+    """pgvector column that reads and writes the same float32 bytes as LargeBinary"""
+    cache_ok = True
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+    
+    def get_col_spec(self, **kw) -> str:
+        return f"VECTOR({self.dim})"
+    
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            values = struct.unpack(f"<{len(value) // 4}f", value)
+            return "[" + ",".join(repr(v) for v in values) + "]"
+        return process
+    
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None:
+                return None
+            values = [float(v) for v in value.strip("[]").split(",")] if value != "[]" else []
+            return struct.pack(f"<{len(values)}f", *values)
+        return process
+
+class ProfileEmbedding(Base):
+    __tablename__ = "profile_embeddings"
+    
+    profile_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("linkedin_profiles.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
+    # Embedder that produced the vector, e.g. hashing-v1-256
+    model = Column(String(32), nullable=False)
+    dim = Column(Integer, nullable=False)
+    # Little-endian float32; a pgvector column on Postgres
+    embedding = Column(LargeBinary().with_variant(Vector(EMBEDDING_DIM), "postgresql"), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,42 @@
+# backend/models/message.py
+from sqlalchemy import (
+    Column, String, Text, DateTime, Float, Boolean, Integer,
+    BigInteger, SmallInteger, ForeignKey, Index, Uuid
+)
+from datetime import datetime
+from .base import Base
+
+class GeneratedMessage(Base):
+    __tablename__ = "generated_messages"
+    
+    # SQLite only auto-increments INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    profile_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("linkedin_profiles.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    message_type = Column(String(32), nullable=False)
+    industry = Column(String(64), nullable=False)
+    template_id = Column(SmallInteger, nullable=False)
+    content = Column(Text, nullable=False)
+    content_hash = Column(String(16), nullable=False)
+    tone = Column(String(32), nullable=True)
+    confidence_score = Column(Float, nullable=True)
+    is_selected = Column(Boolean, nullable=False, default=False)
+    # Outcome reported by the client: sent, accepted, replied or ignored
+    outcome = Column(String(16), nullable=True)
+    outcome_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_generated_messages_profile_id", "profile_id"),
+        # Covers a user's "best template per industry" aggregates over messages with outcomes
+        Index(
+            "ix_generated_messages_user_template_outcomes",
+            "user_id", "message_type", "industry", "template_id", "outcome",
+            postgresql_where=outcome.isnot(None),
+            sqlite_where=outcome.isnot(None)
+        ),
+    )
@@ -1,6 +1,5 @@
 # backend/models/profile.py
-from sqlalchemy import Column, String, DateTime, Float, JSON, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Float, JSON, ForeignKey, Index, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -9,8 +8,8 @@ from .base import Base
 class LinkedInProfile(Base):
     __tablename__ = "linkedin_profiles"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
     linkedin_url = Column(String, nullable=False)
     profile_data = Column(JSON, default=dict)
     ai_insights = Column(JSON, default=dict)
@@ -19,4 +18,10 @@ class LinkedInProfile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="profiles")
\ No newline at end of file
+    user = relationship("User", back_populates="profiles")
+    
+    # Ordered, incremental exports per user (GET /api/profiles/export?since=)
+    __table_args__ = (
+        Index("ix_linkedin_profiles_user_last_analyzed", "user_id", "last_analyzed"),
+        Index("ix_linkedin_profiles_user_created_at", "user_id", "created_at"),
+    )
@@ -0,0 +1,20 @@
+# backend/models/search.py
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Uuid
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from datetime import datetime
+from .base import Base
+
+class ProfileSearchDocument(Base):
+    __tablename__ = "profile_search_documents"
+    
+    profile_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("linkedin_profiles.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
+    # Plain concatenated text, indexed with pg_trgm for fuzzy matching
+    document = Column(Text, nullable=False, default="")
+    # Weighted tsvector (name > title/company > posts); plain text outside Postgres
+    search_vector = Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
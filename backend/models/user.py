@@ -1,6 +1,6 @@
 # backend/models/user.py
-from sqlalchemy import Column, String, DateTime, Boolean, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Boolean, JSON, Uuid
+from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from .base import Base
@@ -8,7 +8,7 @@ from .base import Base
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
@@ -16,4 +16,7 @@ class User(Base):
     linkedin_profile_url = Column(String, nullable=True)
     settings = Column(JSON, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    profiles = relationship("LinkedInProfile", back_populates="user")
\ No newline at end of file
@@ -0,0 +1,58 @@
+# backend/schemas/agents.py
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+
+# Keys of PersonalizationAgent.message_templates
+MessageType = Literal["connection_request", "follow_up"]
+
+class AnalyzeProfileRequest(BaseModel):
+    profile_url: Optional[str] = None
+    message_type: MessageType = "connection_request"
+    message_types: List[MessageType] = []
+    refresh: bool = False
+
+# Response fields default to None so ?fields= selections can leave them unset;
+# routes use response_model_exclude_unset to drop whatever was not selected.
+
+class MessageVariantResponse(BaseModel):
+    message_type: Optional[str] = None
+    template_id: Optional[int] = None
+    content: Optional[str] = None
+    tone: Optional[str] = None
+    confidence_score: Optional[float] = None
+    personalization_elements: Optional[Dict[str, str]] = None
+
+class AnalysisResponse(BaseModel):
+    profile_data: Optional[Dict[str, Any]] = None
+    ai_insights: Optional[Dict[str, Any]] = None
+    engagement_score: Optional[float] = None
+    personalized_messages: Optional[List[MessageVariantResponse]] = None
+    selected_message: Optional[MessageVariantResponse] = None
+    selected_messages: Optional[Dict[str, MessageVariantResponse]] = None
+
+class AnalyzeProfileResponse(BaseModel):
+    status: Optional[str] = None
+    profile_id: Optional[str] = None
+    analysis: Optional[AnalysisResponse] = None
+    message_ids: Optional[List[int]] = None
+    workflow_metadata: Optional[Dict[str, Any]] = None
+    errors: Optional[List[str]] = None
+
+class StoredMessageResponse(BaseModel):
+    id: Optional[int] = None
+    message_type: Optional[str] = None
+    template_id: Optional[int] = None
+    content: Optional[str] = None
+    content_hash: Optional[str] = None
+    tone: Optional[str] = None
+    confidence_score: Optional[float] = None
+    is_selected: Optional[bool] = None
+    outcome: Optional[str] = None
+    outcome_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class ProfileMessagesResponse(BaseModel):
+    profile_id: Optional[str] = None
+    selected_message: Optional[StoredMessageResponse] = None
+    messages: Optional[List[StoredMessageResponse]] = None
@@ -0,0 +1,41 @@
+# backend/schemas/profile.py
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+class ProfileSummaryFields(BaseModel):
+    name: str
+    title: str
+    company: str
+
+class ProfileSummaryResponse(BaseModel):
+    id: str
+    linkedin_url: str
+    engagement_score: Optional[float] = None
+    last_analyzed: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    profile_summary: ProfileSummaryFields
+
+class ProfileSearchResult(ProfileSummaryResponse):
+    rank: float
+
+class ProfileSearchResponse(BaseModel):
+    query: str
+    results: List[ProfileSearchResult]
+
+class SimilarProfileResult(ProfileSummaryResponse):
+    similarity: float
+
+class SimilarProfilesResponse(BaseModel):
+    profile_id: str
+    results: List[SimilarProfileResult]
+
+class ProfileDetailResponse(BaseModel):
+    # All optional so ?fields= can select a subset
+    id: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    profile_data: Optional[Dict[str, Any]] = None
+    ai_insights: Optional[Dict[str, Any]] = None
+    engagement_score: Optional[float] = None
+    last_analyzed: Optional[datetime] = None
+    created_at: Optional[datetime] = None
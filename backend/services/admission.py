@@ -0,0 +1,219 @@
+# backend/services/admission.py
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from services.redis_client import get_async_redis
+
+@dataclass(frozen=True)
+class TierLimits:
+    requests_per_minute: int
+    burst: int
+    max_concurrent_workflows: int
+
+TIER_LIMITS: Dict[str, TierLimits] = {
+    "free": TierLimits(requests_per_minute=60, burst=20, max_concurrent_workflows=1),
+    "pro": TierLimits(requests_per_minute=600, burst=100, max_concurrent_workflows=5),
+    "enterprise": TierLimits(requests_per_minute=3000, burst=500, max_concurrent_workflows=20)
+}
+DEFAULT_TIER = "free"
+
+# Workflows in flight across all workers before new ones are shed
+MAX_INFLIGHT_WORKFLOWS = int(os.getenv("ADMISSION_MAX_INFLIGHT_WORKFLOWS", "64"))
+# Per-worker cap used while Redis is unavailable
+LOCAL_MAX_INFLIGHT_WORKFLOWS = int(os.getenv("ADMISSION_LOCAL_MAX_INFLIGHT_WORKFLOWS", str(MAX_INFLIGHT_WORKFLOWS)))
+# In-flight entries older than this are assumed to belong to a crashed worker
+WORKFLOW_LEASE_SECONDS = float(os.getenv("ADMISSION_WORKFLOW_LEASE_SECONDS", "120"))
+# Retry-After hint when rejecting on concurrency rather than rate
+BUSY_RETRY_AFTER_SECONDS = float(os.getenv("ADMISSION_BUSY_RETRY_AFTER_SECONDS", "2"))
+# After a Redis error, use the in-process limiter for this long instead of
+# paying the socket timeout on every request
+REDIS_RETRY_SECONDS = float(os.getenv("ADMISSION_REDIS_RETRY_SECONDS", "5"))
+
+KEY_PREFIX = "linkedintelligence:admission"
+
+# Token bucket plus in-flight workflow sets, checked and updated in one round trip.
+# Rejections do not consume a token. Returns {allowed, retry_after_ms, reason}.
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+if tokens < 1 then
+    return {0, math.ceil((1 - tokens) / rate), "rate_limited"}
+end
+
+if ARGV[4] == "1" then
+    local lease = tonumber(ARGV[7])
+    redis.call("ZREMRANGEBYSCORE", KEYS[2], "-inf", now - lease)
+    redis.call("ZREMRANGEBYSCORE", KEYS[3], "-inf", now - lease)
+    if redis.call("ZCARD", KEYS[3]) >= tonumber(ARGV[6]) then
+        return {0, -1, "overloaded"}
+    end
+    if redis.call("ZCARD", KEYS[2]) >= tonumber(ARGV[5]) then
+        return {0, -1, "too_many_workflows"}
+    end
+    redis.call("ZADD", KEYS[2], now, ARGV[8])
+    redis.call("ZADD", KEYS[3], now, ARGV[8])
+    redis.call("PEXPIRE", KEYS[2], lease)
+    redis.call("PEXPIRE", KEYS[3], lease)
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens - 1, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate))
+return {1, 0, "ok"}
+"""
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    reason: str = "ok"
+    retry_after: float = 0.0  # Seconds
+
+ALLOWED = Decision(True)
+
+def tier_limits(tier: Optional[str]) -> TierLimits:
+    return TIER_LIMITS.get(tier or DEFAULT_TIER, TIER_LIMITS[DEFAULT_TIER])
+
+def _busy(reason: str) -> Decision:
+    return Decision(False, reason, BUSY_RETRY_AFTER_SECONDS)
+
+class LocalAdmission:
+    """In-process token buckets and workflow counters; exact per worker only"""
+
+    def __init__(self, max_inflight: int = LOCAL_MAX_INFLIGHT_WORKFLOWS, max_subjects: int = 100000):
+        self.max_inflight = max_inflight
+        self.max_subjects = max_subjects
+        self._buckets: Dict[str, list] = {}  # subject -> [tokens, updated_at]
+        self._inflight: Dict[str, Set[str]] = {}
+        self._inflight_total = 0
+
+    def acquire(self, subject: str, tier: Optional[str], workflow: bool, request_id: str) -> Decision:
+        limits = tier_limits(tier)
+        rate = limits.requests_per_minute / 60.0
+        now = time.monotonic()
+
+        bucket = self._buckets.get(subject)
+        if bucket is None:
+            if len(self._buckets) >= self.max_subjects:
+                self._buckets.clear()  # Full buckets are the default state, so dropping them is safe
+            bucket = self._buckets[subject] = [float(limits.burst), now]
+        tokens = min(limits.burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return Decision(False, "rate_limited", (1 - tokens) / rate)
+
+        if workflow:
+            if self._inflight_total >= self.max_inflight:
+                bucket[0] = tokens
+                return _busy("overloaded")
+            running = self._inflight.setdefault(subject, set())
+            if len(running) >= limits.max_concurrent_workflows:
+                bucket[0] = tokens
+                return _busy("too_many_workflows")
+            running.add(request_id)
+            self._inflight_total += 1
+
+        bucket[0] = tokens - 1
+        return ALLOWED
+
+    def release(self, subject: str, request_id: str) -> None:
+        running = self._inflight.get(subject)
+        if running and request_id in running:
+            running.discard(request_id)
+            self._inflight_total -= 1
+            if not running:
+                del self._inflight[subject]
+
+class AdmissionController:
+    """Admission decisions in Redis, shared by all workers, with an in-process fallback
+
+    Uses the asyncio Redis client, so a slow Redis delays only the requests
+    waiting on it rather than every request on the event loop.
+    """
+
+    def __init__(self, local: Optional[LocalAdmission] = None):
+        self.local = local or LocalAdmission()
+        self._script = None
+        self._redis_down_until = 0.0
+        self._local_requests: Set[str] = set()
+
+    def _redis(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        client = get_async_redis()
+        if client is not None and self._script is None:
+            self._script = client.register_script(ADMIT_SCRIPT)
+        return client
+
+    def _redis_failed(self, e: Exception) -> None:
+        print(f"Admission control falling back to in-process limits: {e}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def acquire(self, subject: str, tier: Optional[str], workflow: bool, request_id: str) -> Decision:
+        """Admit or reject one request; workflow requests also take a concurrency slot"""
+        client = self._redis()
+        if client is not None:
+            limits = tier_limits(tier)
+            try:
+                allowed, retry_after_ms, reason = await self._script(
+                    keys=[
+                        f"{KEY_PREFIX}:bucket:{subject}",
+                        f"{KEY_PREFIX}:inflight:{subject}",
+                        f"{KEY_PREFIX}:inflight"
+                    ],
+                    args=[
+                        int(time.time() * 1000),
+                        limits.requests_per_minute / 60000.0,
+                        limits.burst,
+                        1 if workflow else 0,
+                        limits.max_concurrent_workflows,
+                        MAX_INFLIGHT_WORKFLOWS,
+                        int(WORKFLOW_LEASE_SECONDS * 1000),
+                        request_id
+                    ],
+                    client=client
+                )
+            except Exception as e:
+                self._redis_failed(e)
+            else:
+                reason = reason.decode() if isinstance(reason, bytes) else reason
+                if allowed:
+                    return ALLOWED
+                if retry_after_ms < 0:
+                    return _busy(reason)
+                return Decision(False, reason, retry_after_ms / 1000)
+
+        decision = self.local.acquire(subject, tier, workflow, request_id)
+        if decision.allowed and workflow:
+            self._local_requests.add(request_id)
+        return decision
+
+    async def release(self, subject: str, request_id: str) -> None:
+        """Free a workflow slot taken by acquire()"""
+        if request_id in self._local_requests:
+            self._local_requests.discard(request_id)
+            self.local.release(subject, request_id)
+            return
+
+        client = self._redis()
+        if client is None:
+            return  # The lease expires the entry
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.zrem(f"{KEY_PREFIX}:inflight:{subject}", request_id)
+            pipe.zrem(f"{KEY_PREFIX}:inflight", request_id)
+            await pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+def retry_after_header(decision: Decision) -> str:
+    """Retry-After in whole seconds, at least 1"""
+    return str(max(1, math.ceil(decision.retry_after)))
@@ -0,0 +1,131 @@
+# backend/services/analytics.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from agents.profile_fields import extract_company, extract_industry
+from models.analytics import AnalyticsRollup
+
+# Rollup metrics; each is a family of buckets counted per user
+ENGAGEMENT_SCORE = "engagement_score"
+ANALYZED_PER_DAY = "analyzed_per_day"
+COMPANY = "company"
+INDUSTRY = "industry"
+MESSAGE_TYPE = "message_type"
+
+SCORE_BUCKETS = [f"{i / 10:.1f}" for i in range(10)]
+
+def score_bucket(score: float) -> str:
+    """Map an engagement score onto its 0.1-wide histogram bucket"""
+    index = min(max(int((score or 0.0) * 10), 0), 9)
+    return SCORE_BUCKETS[index]
+
+def _upsert(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Increment rollup counters in a single INSERT ... ON CONFLICT statement"""
+    if not rows:
+        return
+
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(AnalyticsRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AnalyticsRollup.user_id, AnalyticsRollup.metric, AnalyticsRollup.bucket],
+        set_={
+            "count": AnalyticsRollup.count + stmt.excluded.count,
+            "value_sum": AnalyticsRollup.value_sum + stmt.excluded.value_sum,
+            "updated_at": stmt.excluded.updated_at
+        }
+    )
+    db.execute(stmt)
+
+def record_profile_analysis(
+    db: Session,
+    user_id: UUID,
+    profile_data: Optional[Dict[str, Any]],
+    engagement_score: Optional[float],
+    message_types: Sequence[str],
+    analyzed_at: datetime
+) -> None:
+    """Fold one analysis into the user's rollups within the caller's transaction
+
+    Rollups count analysis events, so deleting a profile later does not
+    rewrite history. Every message type generated in the analysis is counted.
+    """
+    profile_data = profile_data or {}
+    score = engagement_score or 0.0
+
+    buckets = [
+        (ENGAGEMENT_SCORE, score_bucket(score)),
+        (ANALYZED_PER_DAY, analyzed_at.date().isoformat()),
+        (INDUSTRY, extract_industry(profile_data))
+    ]
+    company = extract_company(profile_data)
+    if company:
+        buckets.append((COMPANY, company))
+    for message_type in dict.fromkeys(message_types):
+        buckets.append((MESSAGE_TYPE, message_type))
+
+    _upsert(db, [
+        {
+            "user_id": user_id,
+            "metric": metric,
+            "bucket": bucket,
+            "count": 1,
+            "value_sum": score,
+            "updated_at": analyzed_at
+        }
+        for metric, bucket in buckets
+    ])
+
+def _rollup_rows(user_id: UUID, metric: str):
+    return select(
+        AnalyticsRollup.bucket,
+        AnalyticsRollup.count,
+        AnalyticsRollup.value_sum
+    ).where(
+        AnalyticsRollup.user_id == user_id,
+        AnalyticsRollup.metric == metric
+    )
+
+def get_engagement_distribution(db: Session, user_id: UUID) -> List[Dict[str, Any]]:
+    """Histogram of engagement scores, including empty buckets"""
+    counts = {row.bucket: row.count for row in db.execute(_rollup_rows(user_id, ENGAGEMENT_SCORE))}
+    return [{"bucket": bucket, "count": counts.get(bucket, 0)} for bucket in SCORE_BUCKETS]
+
+def get_daily_analyses(db: Session, user_id: UUID, days: int) -> List[Dict[str, Any]]:
+    """Profiles analyzed per day over the trailing window, oldest first"""
+    start = datetime.utcnow().date() - timedelta(days=days - 1)
+    stmt = _rollup_rows(user_id, ANALYZED_PER_DAY).where(
+        AnalyticsRollup.bucket >= start.isoformat()
+    )
+    rows = {row.bucket: row for row in db.execute(stmt)}
+
+    daily = []
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        row = rows.get(day)
+        daily.append({
+            "date": day,
+            "profiles_analyzed": row.count if row else 0,
+            "average_engagement_score": row.value_sum / row.count if row and row.count else None
+        })
+    return daily
+
+def get_top_buckets(db: Session, user_id: UUID, metric: str, limit: int) -> List[Dict[str, Any]]:
+    """Most frequent buckets of a metric (companies, industries, message types)"""
+    stmt = _rollup_rows(user_id, metric).order_by(
+        AnalyticsRollup.count.desc(),
+        AnalyticsRollup.bucket
+    ).limit(limit)
+    return [
+        {
+            "name": row.bucket,
+            "count": row.count,
+            "average_engagement_score": row.value_sum / row.count if row.count else None
+        }
+        for row in db.execute(stmt)
+    ]
@@ -0,0 +1,91 @@
+# backend/services/bandit_store.py
+import os
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from agents.bandit import ThompsonSamplingSelector
+from services import messages as message_store
+from services.redis_client import get_redis
+
+SNAPSHOT_KEY = os.getenv("BANDIT_SNAPSHOT_KEY", "linkedintelligence:bandit:snapshot")
+# How often each worker refreshes its posteriors from the database, picking
+# up outcomes recorded by other workers
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("BANDIT_SNAPSHOT_INTERVAL_SECONDS", "60"))
+# Snapshots are immutable per version, so they only need to outlive a refresh round
+SNAPSHOT_TTL_SECONDS = float(os.getenv("BANDIT_SNAPSHOT_TTL_SECONDS", "3600"))
+
+# Terminal outcomes that carry a reward signal; "sent" does not
+REWARDS = {"accepted": True, "replied": True, "ignored": False}
+
+class BanditSnapshotStore:
+    """Loads the selector from generated_messages and keeps it fresh
+
+    generated_messages is the only source of truth. The Redis snapshot is a
+    cache of outcome_counts() keyed by outcome_version(), so every worker that
+    writes a given version writes identical bytes and none can overwrite
+    another's updates. Between refreshes the selector also folds in this
+    worker's own outcomes as they are recorded.
+    """
+
+    def __init__(self, selector: ThompsonSamplingSelector):
+        self.selector = selector
+        self._loaded_at: Optional[float] = None
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load posteriors on first use and again every SNAPSHOT_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < SNAPSHOT_INTERVAL_SECONDS:
+            return
+        self._loaded_at = now
+
+        version = message_store.outcome_version(db)
+        snapshot = self._read_snapshot(version)
+        if snapshot is not None:
+            try:
+                self.selector.restore(snapshot)
+                return
+            except ValueError as e:
+                print(f"Ignoring unreadable bandit snapshot: {e}")
+
+        self.selector.load_counts(message_store.outcome_counts(db))
+        self._write_snapshot(version, self.selector.snapshot())
+
+    def record_outcome(
+        self,
+        message_type: str,
+        template_id: int,
+        industry: str,
+        outcome: str,
+        previous_outcome: Optional[str]
+    ) -> None:
+        """Update the selector the first time a message reaches a terminal outcome"""
+        if outcome not in REWARDS or previous_outcome in REWARDS:
+            return
+
+        self.selector.update(message_type, template_id, industry, REWARDS[outcome])
+
+    def _snapshot_key(self, version: str) -> str:
+        return f"{SNAPSHOT_KEY}:{version}"
+
+    def _write_snapshot(self, version: str, snapshot: bytes) -> None:
+        client = get_redis()
+        if client is None:
+            return
+
+        try:
+            client.set(self._snapshot_key(version), snapshot, ex=int(SNAPSHOT_TTL_SECONDS))
+        except Exception as e:
+            print(f"Bandit snapshot failed: {e}")
+
+    def _read_snapshot(self, version: str) -> Optional[bytes]:
+        client = get_redis()
+        if client is None:
+            return None
+
+        try:
+            return client.get(self._snapshot_key(version))
+        except Exception as e:
+            print(f"Bandit snapshot read failed: {e}")
+            return None
@@ -0,0 +1,223 @@
+# backend/services/export.py
+import csv
+import io
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+import orjson
+from sqlalchemy import or_, select
+
+from agents.profile_fields import extract_company, extract_industry, extract_name, extract_title
+from models.base import REPLICA_MAX_LAG_SECONDS, session_router
+from models.profile import LinkedInProfile
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),  # Starlette appends the utf-8 charset
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+SINCE_FIELDS = ("last_analyzed", "created_at")
+
+COLUMNS = [
+    "id",
+    "linkedin_url",
+    "name",
+    "title",
+    "company",
+    "industry",
+    "engagement_score",
+    "last_analyzed",
+    "created_at",
+    "profile_data",
+    "ai_insights"
+]
+
+# Rows fetched per round trip from the server-side cursor
+BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Rows per Parquet row group; bounds the memory of a Parquet export
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("EXPORT_PARQUET_ROW_GROUP_SIZE", "50000"))
+# How far the export watermark trails the clock. Timestamps are set before
+# commit, so a row stamped just before the watermark may still be in flight
+# (or not yet on the replica); it must land before the watermark passes it.
+WATERMARK_LAG_SECONDS = float(os.getenv("EXPORT_WATERMARK_LAG_SECONDS", str(max(5.0, 2 * REPLICA_MAX_LAG_SECONDS))))
+
+Row = Dict[str, Any]
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def export_watermark() -> datetime:
+    """Upper bound for an export's rows, and the since= of the next incremental export"""
+    return datetime.utcnow() - timedelta(seconds=WATERMARK_LAG_SECONDS)
+
+def iter_profile_batches(
+    user_id: UUID,
+    since: Optional[datetime],
+    since_field: str,
+    until: datetime,
+    batch_size: int = BATCH_SIZE
+) -> Iterator[List[Row]]:
+    """Stream a user's profiles in batches from a server-side cursor
+
+    Runs in its own read session, on a replica when the router allows it,
+    because the response body is produced after the request's session is
+    gone. Rows with since_field in (since, until] are
+    exported, oldest first; until pins the snapshot so the next incremental
+    export can start exactly where this one ended.
+    """
+    field = getattr(LinkedInProfile, since_field)
+    stmt = select(
+        LinkedInProfile.id,
+        LinkedInProfile.linkedin_url,
+        LinkedInProfile.profile_data,
+        LinkedInProfile.ai_insights,
+        LinkedInProfile.engagement_score,
+        LinkedInProfile.last_analyzed,
+        LinkedInProfile.created_at
+    ).where(LinkedInProfile.user_id == user_id)
+
+    if since is not None:
+        stmt = stmt.where(field > since, field <= until)
+    else:
+        stmt = stmt.where(or_(field.is_(None), field <= until))
+
+    # Served by ix_linkedin_profiles_user_<field>
+    stmt = stmt.order_by(field, LinkedInProfile.id)
+
+    with session_router.read_session(user_id) as session:
+        result = session.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        for partition in result.partitions():
+            yield [_to_row(row) for row in partition]
+
+def _to_row(row) -> Row:
+    profile_data = row.profile_data or {}
+    return {
+        "id": str(row.id),
+        "linkedin_url": row.linkedin_url,
+        "name": extract_name(profile_data),
+        "title": extract_title(profile_data),
+        "company": extract_company(profile_data),
+        "industry": extract_industry(profile_data),
+        "engagement_score": row.engagement_score,
+        "last_analyzed": row.last_analyzed,
+        "created_at": row.created_at,
+        "profile_data": profile_data,
+        "ai_insights": row.ai_insights or {}
+    }
+
+def _json_text(value: Any) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
+def encode_csv(batches: Iterable[List[Row]]) -> Iterator[bytes]:
+    """One CSV chunk per batch; nested JSON columns are written as JSON text"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+
+    for batch in batches:
+        for row in batch:
+            writer.writerow([
+                row["id"],
+                row["linkedin_url"],
+                row["name"],
+                row["title"],
+                row["company"],
+                row["industry"],
+                row["engagement_score"],
+                row["last_analyzed"].isoformat() if row["last_analyzed"] else "",
+                row["created_at"].isoformat() if row["created_at"] else "",
+                _json_text(row["profile_data"]),
+                _json_text(row["ai_insights"])
+            ])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def encode_ndjson(batches: Iterable[List[Row]]) -> Iterator[bytes]:
+    """One JSON object per line, nested columns kept as objects"""
+    for batch in batches:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in batch)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def encode_parquet(batches: Iterable[List[Row]], row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """Columnar row groups, each flushed to the client as soon as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("linkedin_url", pa.string()),
+        ("name", pa.string()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("industry", pa.string()),
+        ("engagement_score", pa.float64()),
+        ("last_analyzed", pa.timestamp("us")),
+        ("created_at", pa.timestamp("us")),
+        ("profile_data", pa.string()),
+        ("ai_insights", pa.string())
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    columns: Dict[str, list] = {name: [] for name in COLUMNS}
+    pending = 0
+
+    def write_row_group() -> bytes:
+        writer.write_table(pa.table(columns, schema=schema), row_group_size=row_group_size)
+        for values in columns.values():
+            values.clear()
+        return sink.drain()
+
+    for batch in batches:
+        for row in batch:
+            for name in COLUMNS:
+                value = row[name]
+                columns[name].append(_json_text(value) if name in ("profile_data", "ai_insights") else value)
+        pending += len(batch)
+        if pending >= row_group_size:
+            pending = 0
+            yield write_row_group()
+
+    if pending:
+        yield write_row_group()
+    writer.close()
+    yield sink.drain()
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet
+}
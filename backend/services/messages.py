@@ -0,0 +1,164 @@
+# backend/services/messages.py
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from agents.base import MessageVariant
+from models.message import GeneratedMessage
+
+OUTCOMES = ("sent", "accepted", "replied", "ignored")
+POSITIVE_OUTCOMES = ("accepted", "replied")
+# Outcomes that settle whether a message worked; "sent" is still pending
+RESOLVED_OUTCOMES = ("accepted", "replied", "ignored")
+
+def content_hash(content: str) -> str:
+    """Short stable fingerprint of rendered message content"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+def store_generated_messages(
+    db: Session,
+    profile_id: UUID,
+    user_id: UUID,
+    industry: str,
+    messages: List[MessageVariant],
+    selected_messages: Sequence[MessageVariant]
+) -> List[int]:
+    """Insert all message variants in one batched statement, returning ids in input order"""
+    if not messages:
+        return []
+
+    rows = [
+        {
+            "profile_id": profile_id,
+            "user_id": user_id,
+            "message_type": message.message_type,
+            "industry": industry,
+            "template_id": message.template_id,
+            "content": message.content,
+            "content_hash": content_hash(message.content),
+            "tone": message.tone,
+            "confidence_score": message.confidence_score,
+            "is_selected": message in selected_messages,
+            "created_at": datetime.utcnow()
+        }
+        for message in messages
+    ]
+
+    stmt = insert(GeneratedMessage).returning(GeneratedMessage.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows))
+
+def serialize_message(message: GeneratedMessage) -> Dict[str, Any]:
+    return {
+        "id": message.id,
+        "message_type": message.message_type,
+        "template_id": message.template_id,
+        "content": message.content,
+        "content_hash": message.content_hash,
+        "tone": message.tone,
+        "confidence_score": message.confidence_score,
+        "is_selected": message.is_selected,
+        "outcome": message.outcome,
+        "outcome_at": message.outcome_at,
+        "created_at": message.created_at
+    }
+
+def get_profile_messages(
+    db: Session,
+    profile_id: UUID,
+    user_id: UUID,
+    message_type: Optional[str] = None
+) -> List[GeneratedMessage]:
+    """Stored messages for a profile, selected messages first"""
+    query = db.query(GeneratedMessage).filter(
+        GeneratedMessage.profile_id == profile_id,
+        GeneratedMessage.user_id == user_id
+    )
+    if message_type:
+        query = query.filter(GeneratedMessage.message_type == message_type)
+
+    return query.order_by(
+        GeneratedMessage.is_selected.desc(),
+        GeneratedMessage.message_type,
+        GeneratedMessage.template_id
+    ).all()
+
+def get_message(db: Session, message_id: int, user_id: UUID) -> Optional[GeneratedMessage]:
+    """A stored message, or None if it does not belong to the user"""
+    return db.query(GeneratedMessage).filter(
+        GeneratedMessage.id == message_id,
+        GeneratedMessage.user_id == user_id
+    ).first()
+
+def record_outcome(message: GeneratedMessage, outcome: str) -> GeneratedMessage:
+    """Store the client-reported outcome of a message"""
+    message.outcome = outcome
+    message.outcome_at = datetime.utcnow()
+    return message
+
+def outcome_counts(db: Session) -> List[Tuple[str, int, str, int, int]]:
+    """Positive and negative outcome counts per (message_type, template_id, industry)"""
+    positive = func.sum(case((GeneratedMessage.outcome.in_(POSITIVE_OUTCOMES), 1), else_=0))
+    negative = func.sum(case((GeneratedMessage.outcome == "ignored", 1), else_=0))
+
+    stmt = select(
+        GeneratedMessage.message_type,
+        GeneratedMessage.template_id,
+        GeneratedMessage.industry,
+        positive,
+        negative
+    ).where(
+        GeneratedMessage.outcome.isnot(None)
+    ).group_by(
+        GeneratedMessage.message_type,
+        GeneratedMessage.template_id,
+        GeneratedMessage.industry
+    )
+
+    return [tuple(row) for row in db.execute(stmt)]
+
+def outcome_version(db: Session) -> str:
+    """Changes whenever an outcome is recorded; keys cached outcome_counts() results"""
+    count, latest = db.execute(
+        select(func.count(GeneratedMessage.outcome), func.max(GeneratedMessage.outcome_at))
+    ).one()
+    return f"{count}:{latest.isoformat() if latest else ''}"
+
+def best_templates_by_industry(db: Session, user_id: UUID, message_type: str) -> List[Dict[str, Any]]:
+    """Best-performing template per industry by smoothed positive-outcome rate, for one user"""
+    positive = func.sum(case((GeneratedMessage.outcome.in_(POSITIVE_OUTCOMES), 1), else_=0))
+    resolved = func.count(GeneratedMessage.outcome)
+
+    # Served by the partial index on (user_id, message_type, industry, template_id, outcome)
+    stmt = select(
+        GeneratedMessage.industry,
+        GeneratedMessage.template_id,
+        resolved.label("resolved"),
+        positive.label("positive")
+    ).where(
+        GeneratedMessage.user_id == user_id,
+        GeneratedMessage.message_type == message_type,
+        GeneratedMessage.outcome.in_(RESOLVED_OUTCOMES)
+    ).group_by(
+        GeneratedMessage.industry,
+        GeneratedMessage.template_id
+    )
+
+    best: Dict[str, Dict[str, Any]] = {}
+    for row in db.execute(stmt):
+        # Laplace smoothing keeps one lucky reply from beating a proven template
+        rate = (row.positive + 1) / (row.resolved + 2)
+        current = best.get(row.industry)
+        if current is None or rate > current["positive_rate"]:
+            best[row.industry] = {
+                "industry": row.industry,
+                "template_id": row.template_id,
+                "resolved": row.resolved,
+                "positive": row.positive,
+                "positive_rate": rate
+            }
+
+    return sorted(best.values(), key=lambda entry: entry["industry"])
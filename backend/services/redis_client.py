@@ -0,0 +1,32 @@
+# backend/services/redis_client.py
+import os
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+_client = None
+
+def get_redis():
+    """Shared Redis client, or None when REDIS_URL is not configured"""
+    global _client
+    if _client is None and REDIS_URL:
+        import redis
+        _client = redis.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    return _client
+
+_async_client = None
+
+def get_async_redis():
+    """Shared redis.asyncio client for code running on the event loop, or None"""
+    global _async_client
+    if _async_client is None and REDIS_URL:
+        import redis.asyncio
+        _async_client = redis.asyncio.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    return _async_client
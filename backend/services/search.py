@@ -0,0 +1,256 @@
+# backend/services/search.py
+import math
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Text, delete, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from agents.profile_fields import (
+    extract_name,
+    extract_title,
+    extract_company,
+    extract_recent_post_text
+)
+from models.base import engine
+from models.profile import LinkedInProfile
+from models.search import ProfileSearchDocument
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 'simple' avoids English stemming so names and companies match verbatim
+TS_CONFIG = literal_column("'simple'::regconfig")
+
+# Field weights mirror the Postgres ts_rank defaults for labels A, B, C
+FIELD_WEIGHTS = {"name": 1.0, "title": 0.4, "company": 0.4, "posts": 0.2}
+
+SearchHit = Tuple[UUID, float]
+
+def build_search_fields(profile_data: Dict[str, Any]) -> Dict[str, str]:
+    """Collect the searchable text fields of a profile"""
+    return {
+        "name": extract_name(profile_data),
+        "title": extract_title(profile_data),
+        "company": extract_company(profile_data),
+        "posts": extract_recent_post_text(profile_data)
+    }
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """Build a to_tsquery expression ANDing all terms, last term as a prefix"""
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    tokens[-1] = f"{tokens[-1]}:*"
+    return " & ".join(tokens)
+
+class PostgresSearchIndex:
+    """Search backed by a weighted tsvector column and a pg_trgm index
+
+    Typo tolerance uses word similarity: the query is matched against the
+    closest stretch of the document rather than the whole of it, which with
+    several posts joined in would keep plain similarity far below threshold.
+    """
+
+    def index_profile(self, db: Session, profile: LinkedInProfile) -> None:
+        """Upsert the search document for a profile within the caller's transaction"""
+        fields = build_search_fields(profile.profile_data or {})
+        document = " ".join(value for value in fields.values() if value)
+
+        search_vector = (
+            func.setweight(func.to_tsvector(TS_CONFIG, fields["name"]), "A")
+            .op("||")(func.setweight(
+                func.to_tsvector(TS_CONFIG, f"{fields['title']} {fields['company']}"), "B"
+            ))
+            .op("||")(func.setweight(func.to_tsvector(TS_CONFIG, fields["posts"]), "C"))
+        )
+
+        stmt = pg_insert(ProfileSearchDocument).values(
+            profile_id=profile.id,
+            user_id=profile.user_id,
+            document=document,
+            search_vector=search_vector,
+            updated_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProfileSearchDocument.profile_id],
+            set_={
+                "document": stmt.excluded.document,
+                "search_vector": stmt.excluded.search_vector,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        db.execute(stmt)
+
+    def remove_profile(self, db: Session, profile_id: UUID) -> None:
+        """Delete the search document for a profile"""
+        db.execute(
+            delete(ProfileSearchDocument).where(ProfileSearchDocument.profile_id == profile_id)
+        )
+
+    def search(
+        self,
+        db: Session,
+        user_id: UUID,
+        query: str,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[SearchHit]:
+        """Return (profile_id, rank) pairs ordered by full-text rank plus trigram similarity"""
+        ts_expression = build_prefix_tsquery(query)
+        if ts_expression is None:
+            return []
+
+        ts_query = func.to_tsquery(TS_CONFIG, ts_expression)
+        query_text = literal(query, Text)
+        rank = (
+            func.ts_rank_cd(ProfileSearchDocument.search_vector, ts_query)
+            + func.word_similarity(query_text, ProfileSearchDocument.document)
+        )
+
+        stmt = (
+            select(ProfileSearchDocument.profile_id, rank.label("rank"))
+            .where(
+                ProfileSearchDocument.user_id == user_id,
+                or_(
+                    ProfileSearchDocument.search_vector.op("@@")(ts_query),
+                    # pg_trgm.word_similarity_threshold, served by the gin_trgm_ops index
+                    query_text.op("<%")(ProfileSearchDocument.document)
+                )
+            )
+            .order_by(rank.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+
+        return [(row.profile_id, float(row.rank)) for row in db.execute(stmt)]
+
+class InMemorySearchIndex:
+    """Inverted-index fallback used when the database is not Postgres (SQLite test runs)"""
+
+    def __init__(self):
+        # token -> {profile_id: weighted term frequency}
+        self._postings: Dict[str, Dict[UUID, float]] = defaultdict(dict)
+        # profile_id -> (user_id, tokens indexed for that profile)
+        self._documents: Dict[UUID, Tuple[UUID, List[str]]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def index_profile(self, db: Session, profile: LinkedInProfile) -> None:
+        """Add or replace a profile in the inverted index"""
+        with self._lock:
+            self._index(profile.id, profile.user_id, profile.profile_data or {})
+
+    def remove_profile(self, db: Session, profile_id: UUID) -> None:
+        """Drop a profile from the inverted index"""
+        with self._lock:
+            self._remove(profile_id)
+
+    def search(
+        self,
+        db: Session,
+        user_id: UUID,
+        query: str,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[SearchHit]:
+        """Return (profile_id, rank) pairs matching every query term, last term as a prefix"""
+        self._ensure_loaded(db)
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            total_documents = max(len(self._documents), 1)
+            scores: Optional[Dict[UUID, float]] = None
+
+            for position, token in enumerate(tokens):
+                if position == len(tokens) - 1:
+                    terms = [term for term in self._postings if term.startswith(token)]
+                else:
+                    terms = [token] if token in self._postings else []
+
+                token_scores: Dict[UUID, float] = defaultdict(float)
+                for term in terms:
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_documents / len(postings))
+                    for profile_id, weight in postings.items():
+                        if self._documents[profile_id][0] == user_id:
+                            token_scores[profile_id] += weight * idf
+
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {
+                        profile_id: score + token_scores[profile_id]
+                        for profile_id, score in scores.items()
+                        if profile_id in token_scores
+                    }
+
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda hit: hit[1], reverse=True)
+        return ranked[skip:skip + limit]
+
+    def _ensure_loaded(self, db: Session) -> None:
+        """Build the index from existing rows the first time it is queried"""
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.query(
+                LinkedInProfile.id,
+                LinkedInProfile.user_id,
+                LinkedInProfile.profile_data
+            ).all()
+            for profile_id, user_id, profile_data in rows:
+                if profile_id not in self._documents:
+                    self._index(profile_id, user_id, profile_data or {})
+            self._loaded = True
+
+    def _index(self, profile_id: UUID, user_id: UUID, profile_data: Dict[str, Any]) -> None:
+        self._remove(profile_id)
+
+        weights: Dict[str, float] = defaultdict(float)
+        for field, text in build_search_fields(profile_data).items():
+            for token in tokenize(text):
+                weights[token] += FIELD_WEIGHTS[field]
+
+        for token, weight in weights.items():
+            self._postings[token][profile_id] = weight
+        self._documents[profile_id] = (user_id, list(weights))
+
+    def _remove(self, profile_id: UUID) -> None:
+        entry = self._documents.pop(profile_id, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(profile_id, None)
+                if not postings:
+                    del self._postings[token]
+
+_search_index = None
+
+def get_search_index():
+    """Return the search backend matching the configured database"""
+    global _search_index
+    if _search_index is None:
+        if engine.dialect.name == "postgresql":
+            _search_index = PostgresSearchIndex()
+        else:
+            _search_index = InMemorySearchIndex()
+    return _search_index
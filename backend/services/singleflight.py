@@ -0,0 +1,194 @@
+# backend/services/singleflight.py
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+from services.redis_client import get_async_redis
+
+LOCK_TTL_SECONDS = float(os.getenv("SINGLEFLIGHT_LOCK_TTL_SECONDS", "30"))
+# Followers are woken by pub/sub; this only bounds the wait on a leader that died
+LOCK_CHECK_SECONDS = float(os.getenv("SINGLEFLIGHT_LOCK_CHECK_SECONDS", "1"))
+
+# Deletes the lock only if this worker still holds it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+Encode = Callable[[Any], bytes]
+Decode = Callable[[bytes], Any]
+
+class SingleFlight:
+    """Share one execution among concurrent calls with the same key
+
+    Within a worker, callers for an in-flight key await the leader's future.
+    Across workers, a Redis SET NX lock elects a leader, which stores its
+    encoded result and wakes the others over pub/sub. All Redis calls use the
+    asyncio client, so waiting never blocks the event loop. Without Redis, or if it fails,
+    coalescing is per worker only.
+
+    With replay=True results are also kept for result_ttl seconds and served
+    to later calls with the same key (idempotent retries); otherwise they are
+    kept only long enough for waiting workers to read them.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        result_ttl: float,
+        replay: bool = False,
+        lock_ttl: float = LOCK_TTL_SECONDS,
+        max_local_results: int = 10000
+    ):
+        self.namespace = namespace
+        self.result_ttl = result_ttl
+        self.replay = replay
+        self.lock_ttl = lock_ttl
+        self.max_local_results = max_local_results
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Replay store used when Redis is not configured: key -> (expires_at, encoded)
+        self._local_results: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def _lock_key(self, key: str) -> str:
+        return f"linkedintelligence:{self.namespace}:lock:{key}"
+
+    def _result_key(self, key: str) -> str:
+        return f"linkedintelligence:{self.namespace}:result:{key}"
+
+    def _done_channel(self, key: str) -> str:
+        return f"linkedintelligence:{self.namespace}:done:{key}"
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        encode: Encode = orjson.dumps,
+        decode: Decode = orjson.loads
+    ) -> Tuple[Any, bool]:
+        """Run fn once per key; returns (result, shared) where shared means another call produced it"""
+        if self.replay:
+            stored = await self._load_result(key)
+            if stored is not None:
+                return decode(stored), True
+
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, shared = await self._run_across_workers(key, fn, encode, decode)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(result)
+        return result, shared
+
+    async def _run_across_workers(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        encode: Encode,
+        decode: Decode
+    ) -> Tuple[Any, bool]:
+        client = get_async_redis()
+        if client is None:
+            result = await fn()
+            if self.replay:
+                self._store_local(key, encode(result))
+            return result, False
+
+        token = uuid.uuid4().hex
+        lock_key = self._lock_key(key)
+        try:
+            acquired = await client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            print(f"Single-flight lock unavailable, running uncoalesced: {e}")
+            return await fn(), False
+
+        if not acquired:
+            stored = await self._wait_for_result(client, key)
+            if stored is not None:
+                return decode(stored), True
+            # The leader failed or timed out without publishing; do the work here
+            return await fn(), False
+
+        try:
+            result = await fn()
+            try:
+                await client.set(self._result_key(key), encode(result), px=int(self.result_ttl * 1000))
+            except Exception as e:
+                print(f"Single-flight result not published: {e}")
+            return result, False
+        finally:
+            try:
+                await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                # Wake followers whether the leader succeeded or failed
+                await client.publish(self._done_channel(key), b"1")
+            except Exception as e:
+                print(f"Single-flight lock release failed: {e}")
+
+    async def _wait_for_result(self, client, key: str) -> Optional[bytes]:
+        """Wait for the leader's done notification, then read its result
+
+        The lock is rechecked every LOCK_CHECK_SECONDS in case the leader died
+        without publishing; its lock then expires after lock_ttl.
+        """
+        deadline = time.monotonic() + self.lock_ttl
+        result_key = self._result_key(key)
+        pubsub = client.pubsub()
+        try:
+            # Subscribe before checking, so a release in between is not missed
+            await pubsub.subscribe(self._done_channel(key))
+            while time.monotonic() < deadline:
+                stored = await client.get(result_key)
+                if stored is not None:
+                    return stored
+                if not await client.exists(self._lock_key(key)):
+                    return await client.get(result_key)
+                timeout = min(LOCK_CHECK_SECONDS, max(deadline - time.monotonic(), 0))
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        except Exception as e:
+            print(f"Single-flight wait failed: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        return None
+
+    async def _load_result(self, key: str) -> Optional[bytes]:
+        client = get_async_redis()
+        if client is not None:
+            try:
+                return await client.get(self._result_key(key))
+            except Exception as e:
+                print(f"Single-flight result read failed: {e}")
+                return None
+
+        entry = self._local_results.get(key)
+        if entry is None:
+            return None
+        expires_at, stored = entry
+        if expires_at < time.monotonic():
+            self._local_results.pop(key, None)
+            return None
+        return stored
+
+    def _store_local(self, key: str, stored: bytes) -> None:
+        self._local_results[key] = (time.monotonic() + self.result_ttl, stored)
+        self._local_results.move_to_end(key)
+        while len(self._local_results) > self.max_local_results:
+            self._local_results.popitem(last=False)
@@ -0,0 +1,353 @@
+# backend/services/vector_index.py
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Float, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from agents.embedding import HashingEmbedder
+from models.base import engine
+from models.embedding import ProfileEmbedding
+from models.profile import LinkedInProfile
+
+# Per-user vector count up to which a brute-force scan is used; it is exact
+# and, at 1 KB per vector, still well under a millisecond per thousand rows
+BRUTE_FORCE_LIMIT = int(os.getenv("VECTOR_BRUTE_FORCE_LIMIT", "20000"))
+# Random-hyperplane LSH used above that: tables x bits per table
+LSH_TABLES = int(os.getenv("VECTOR_LSH_TABLES", "8"))
+LSH_BITS = int(os.getenv("VECTOR_LSH_BITS", "12"))
+# Users whose vectors are kept in memory; older ones are reloaded on demand
+MAX_CACHED_USERS = int(os.getenv("VECTOR_INDEX_MAX_USERS", "1000"))
+
+SimilarHit = Tuple[UUID, float]
+
+_embedder = HashingEmbedder()
+
+def embed_profile(profile_data: Dict[str, Any]) -> bytes:
+    """Embed a profile with the same embedder the workflow uses"""
+    return _embedder.embed(profile_data or {})
+
+def to_vector(embedding: bytes) -> np.ndarray:
+    """View stored float32 bytes as a vector without copying"""
+    return np.frombuffer(embedding, dtype="<f4")
+
+def store_embedding(db: Session, profile_id: UUID, user_id: UUID, embedding: bytes, updated_at: datetime) -> None:
+    """Upsert a profile's embedding within the caller's transaction"""
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(ProfileEmbedding).values(
+        profile_id=profile_id,
+        user_id=user_id,
+        model=_embedder.name,
+        dim=len(embedding) // 4,
+        embedding=embedding,
+        updated_at=updated_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProfileEmbedding.profile_id],
+        set_={
+            "model": stmt.excluded.model,
+            "dim": stmt.excluded.dim,
+            "embedding": stmt.excluded.embedding,
+            "updated_at": stmt.excluded.updated_at
+        }
+    )
+    db.execute(stmt)
+
+def backfill_embeddings(db: Session, batch_size: int = 500) -> int:
+    """Embed profiles analyzed before embeddings existed; the caller commits
+
+    Run by backfill_embeddings.py after upgrading, so searches never write.
+    """
+    missing = (
+        select(LinkedInProfile.id, LinkedInProfile.user_id, LinkedInProfile.profile_data)
+        .outerjoin(ProfileEmbedding, ProfileEmbedding.profile_id == LinkedInProfile.id)
+        .where(ProfileEmbedding.profile_id.is_(None))
+        .limit(batch_size)
+    )
+
+    total = 0
+    while True:
+        rows = db.execute(missing).all()
+        if not rows:
+            return total
+        now = datetime.utcnow()
+        for profile_id, user_id, profile_data in rows:
+            store_embedding(db, profile_id, user_id, embed_profile(profile_data), now)
+        db.flush()
+        total += len(rows)
+
+def similar_profiles_query(user_id: UUID, profile_id: UUID, k: int):
+    """Exact cosine search over one user's embeddings with pgvector
+
+    The user's rows are materialized first so the planner cannot use the HNSW
+    index: filtering its approximate top hits by user afterwards would return
+    fewer than k results for anyone owning a small share of the table.
+    """
+    candidates = (
+        select(ProfileEmbedding.profile_id, ProfileEmbedding.embedding)
+        .where(ProfileEmbedding.user_id == user_id, ProfileEmbedding.profile_id != profile_id)
+        .cte("candidates")
+        .prefix_with("MATERIALIZED", dialect="postgresql")
+    )
+    target = (
+        select(ProfileEmbedding.embedding)
+        .where(ProfileEmbedding.profile_id == profile_id, ProfileEmbedding.user_id == user_id)
+        .scalar_subquery()
+    )
+    distance = candidates.c.embedding.op("<=>", return_type=Float)(target)
+
+    # Like the NumPy backend, only positive similarities count: below that the
+    # two profiles share no hashed features and any score is collision noise
+    return (
+        select(candidates.c.profile_id, (1 - distance).label("similarity"))
+        .where(distance < 1)
+        .order_by(distance)
+        .limit(k)
+    )
+
+class PgVectorIndex:
+    """Similarity search in Postgres with pgvector"""
+
+    def index_profile(self, db: Session, profile_id: UUID, user_id: UUID, embedding: bytes) -> None:
+        """Upsert the embedding for a profile within the caller's transaction"""
+        store_embedding(db, profile_id, user_id, embedding, datetime.utcnow())
+
+    def remove_profile(self, db: Session, profile_id: UUID) -> None:
+        """Delete the embedding for a profile"""
+        db.execute(delete(ProfileEmbedding).where(ProfileEmbedding.profile_id == profile_id))
+
+    def similar(self, db: Session, user_id: UUID, profile_id: UUID, k: int = 10) -> List[SimilarHit]:
+        """Return up to k (profile_id, cosine similarity) pairs with positive similarity, most similar first"""
+        rows = db.execute(similar_profiles_query(user_id, profile_id, k))
+        return [(row.profile_id, float(row.similarity)) for row in rows]
+
+class _LshIndex:
+    """Random-hyperplane LSH; rows sharing a bucket with the query in any table are candidates"""
+
+    def __init__(self, dim: int, tables: int = LSH_TABLES, bits: int = LSH_BITS, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.tables = tables
+        self.bits = bits
+        self.planes = rng.standard_normal((tables * bits, dim)).astype(np.float32)
+        self.powers = 1 << np.arange(bits, dtype=np.int64)
+        self.buckets: List[Dict[int, Set[int]]] = [defaultdict(set) for _ in range(tables)]
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        signs = (vectors @ self.planes.T > 0).reshape(len(vectors), self.tables, self.bits)
+        return signs.astype(np.int64) @ self.powers
+
+    def add(self, rows: List[int], vectors: np.ndarray) -> None:
+        for row, codes in zip(rows, self._codes(vectors)):
+            for buckets, code in zip(self.buckets, codes.tolist()):
+                buckets[code].add(row)
+
+    def remove(self, rows: List[int], vectors: np.ndarray) -> None:
+        for row, codes in zip(rows, self._codes(vectors)):
+            for buckets, code in zip(self.buckets, codes.tolist()):
+                bucket = buckets.get(code)
+                if bucket is not None:
+                    bucket.discard(row)
+                    if not bucket:
+                        del buckets[code]
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        found: Set[int] = set()
+        for buckets, code in zip(self.buckets, self._codes(query[None, :])[0].tolist()):
+            found.update(buckets.get(code, ()))
+            # Multi-probe: buckets one bit away catch near misses
+            for bit in range(self.bits):
+                found.update(buckets.get(code ^ (1 << bit), ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+class _UserVectors:
+    """One user's vectors as rows of a growable float32 matrix"""
+
+    def __init__(self, dim: int, stamp: Tuple[int, Optional[datetime]]):
+        self.dim = dim
+        self.stamp = stamp  # (count, max updated_at) of the rows this copy reflects
+        self.ids: List[UUID] = []
+        self.rows: Dict[UUID, int] = {}
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.lsh: Optional[_LshIndex] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def add(self, profile_id: UUID, vector: np.ndarray) -> None:
+        row = self.rows.get(profile_id)
+        if row is None:
+            if self.size == len(self.matrix):
+                # Grow geometrically so incremental adds are amortized O(1)
+                grown = np.empty((max(16, 2 * len(self.matrix)), self.dim), dtype=np.float32)
+                grown[:self.size] = self.matrix[:self.size]
+                self.matrix = grown
+            row = self.size
+            self.ids.append(profile_id)
+            self.rows[profile_id] = row
+        elif self.lsh is not None:
+            self.lsh.remove([row], self.matrix[row:row + 1])
+
+        self.matrix[row] = vector
+        if self.lsh is not None:
+            self.lsh.add([row], self.matrix[row:row + 1])
+
+    def remove(self, profile_id: UUID) -> None:
+        row = self.rows.pop(profile_id, None)
+        if row is None:
+            return
+
+        last = self.size - 1
+        if self.lsh is not None:
+            touched = [row] if row == last else [row, last]
+            self.lsh.remove(touched, self.matrix[touched])
+
+        # Move the last row into the hole to keep the matrix dense
+        if row != last:
+            moved = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            if self.lsh is not None:
+                self.lsh.add([row], self.matrix[row:row + 1])
+        self.ids.pop()
+
+    def search(self, profile_id: UUID, k: int) -> List[SimilarHit]:
+        row = self.rows.get(profile_id)
+        if row is None or k <= 0:
+            return []
+
+        query = self.matrix[row]
+        candidates = None
+        if self.size > BRUTE_FORCE_LIMIT:
+            if self.lsh is None:
+                self.lsh = _LshIndex(self.dim)
+                self.lsh.add(list(range(self.size)), self.matrix[:self.size])
+            candidates = self.lsh.candidates(query)
+            candidates = candidates[candidates != row]
+            if len(candidates) < k:
+                candidates = None  # Too few to fill the page; fall back to an exact scan
+
+        if candidates is None:
+            candidates = np.arange(self.size)
+            candidates = candidates[candidates != row]
+
+        scores = self.matrix[candidates] @ query
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [
+            (self.ids[candidates[i]], min(float(scores[i]), 1.0))  # Clip float32 rounding
+            for i in top
+            if scores[i] > 0
+        ]
+
+class NumpyVectorIndex:
+    """Embeddings stored as float32 bytes, searched in memory with NumPy
+
+    Each user's vectors are loaded into one contiguous float32 matrix on first
+    query and updated in place as profiles are analyzed or deleted. Small sets
+    are scanned exactly; above BRUTE_FORCE_LIMIT an LSH index narrows the scan.
+    """
+
+    def __init__(self, max_users: int = MAX_CACHED_USERS):
+        self.max_users = max_users
+        self._users: "OrderedDict[UUID, _UserVectors]" = OrderedDict()
+        self._owners: Dict[UUID, UUID] = {}  # profile_id -> user_id, for loaded users
+        self._lock = threading.Lock()
+
+    def index_profile(self, db: Session, profile_id: UUID, user_id: UUID, embedding: bytes) -> None:
+        """Upsert the embedding and add it to the user's loaded vectors"""
+        updated_at = datetime.utcnow()
+        store_embedding(db, profile_id, user_id, embedding, updated_at)
+
+        with self._lock:
+            vectors = self._users.get(user_id)
+            if vectors is not None:
+                count, latest = vectors.stamp
+                new = profile_id not in vectors.rows
+                vectors.add(profile_id, to_vector(embedding))
+                self._owners[profile_id] = user_id
+                vectors.stamp = (count + new, max(latest, updated_at) if latest else updated_at)
+
+    def remove_profile(self, db: Session, profile_id: UUID) -> None:
+        """Delete the embedding and drop it from memory"""
+        db.execute(delete(ProfileEmbedding).where(ProfileEmbedding.profile_id == profile_id))
+
+        with self._lock:
+            user_id = self._owners.pop(profile_id, None)
+            vectors = self._users.get(user_id)
+            if vectors is not None and profile_id in vectors.rows:
+                vectors.remove(profile_id)
+                count, latest = vectors.stamp
+                vectors.stamp = (count - 1, latest)
+
+    def similar(self, db: Session, user_id: UUID, profile_id: UUID, k: int = 10) -> List[SimilarHit]:
+        """Return up to k (profile_id, cosine similarity) pairs with positive similarity, most similar first"""
+        vectors = self._ensure_loaded(db, user_id)
+        with self._lock:
+            return vectors.search(profile_id, k)
+
+    def _stamp(self, db: Session, user_id: UUID) -> Tuple[int, Optional[datetime]]:
+        count, latest = db.execute(
+            select(func.count(), func.max(ProfileEmbedding.updated_at))
+            .where(ProfileEmbedding.user_id == user_id)
+        ).one()
+        return count, latest
+
+    def _ensure_loaded(self, db: Session, user_id: UUID) -> _UserVectors:
+        """Load a user's vectors, or reload them if another worker changed the rows"""
+        stamp = self._stamp(db, user_id)
+        with self._lock:
+            vectors = self._users.get(user_id)
+            if vectors is not None and vectors.stamp == stamp:
+                self._users.move_to_end(user_id)
+                return vectors
+
+        rows = db.execute(
+            select(ProfileEmbedding.profile_id, ProfileEmbedding.embedding)
+            .where(ProfileEmbedding.user_id == user_id, ProfileEmbedding.dim == _embedder.dim)
+        ).all()
+
+        vectors = _UserVectors(_embedder.dim, stamp)
+        if rows:
+            vectors.ids = [profile_id for profile_id, _ in rows]
+            vectors.rows = {profile_id: row for row, profile_id in enumerate(vectors.ids)}
+            vectors.matrix = to_vector(b"".join(embedding for _, embedding in rows)).reshape(len(rows), _embedder.dim).copy()
+
+        with self._lock:
+            previous = self._users.pop(user_id, None)
+            if previous is not None:
+                for profile_id in previous.ids:
+                    self._owners.pop(profile_id, None)
+            self._users[user_id] = vectors
+            self._owners.update((profile_id, user_id) for profile_id in vectors.ids)
+
+            while len(self._users) > self.max_users:
+                _, evicted = self._users.popitem(last=False)
+                for profile_id in evicted.ids:
+                    self._owners.pop(profile_id, None)
+        return vectors
+
+_vector_index = None
+
+def get_vector_index():
+    """Return the vector backend: pgvector on Postgres unless VECTOR_BACKEND=numpy"""
+    global _vector_index
+    if _vector_index is None:
+        backend = os.getenv("VECTOR_BACKEND") or ("pgvector" if engine.dialect.name == "postgresql" else "numpy")
+        if backend == "pgvector":
+            _vector_index = PgVectorIndex()
+        else:
+            _vector_index = NumpyVectorIndex()
+    return _vector_index
@@ -0,0 +1,55 @@
+# benchmarks/bench_agents.py
+"""Orchestrator throughput and per-agent _execute_logic latency"""
+import asyncio
+import time
+
+from benchmarks.common import Metrics, latency_metrics, metric, quiet, time_calls
+
+def run(iterations: int = 500) -> Metrics:
+    from agents.orchestrator import LinkedIntelligenceOrchestrator
+    from agents.profile_intelligence import ProfileIntelligenceAgent
+    from agents.personalization import PersonalizationAgent
+
+    metrics: Metrics = {}
+
+    profile_agent = ProfileIntelligenceAgent()
+    personalization_agent = PersonalizationAgent()
+    state = {
+        "user_id": "bench-user",
+        "profile_url": "https://linkedin.com/in/bench",
+        "message_type": "connection_request",
+        "errors": [],
+        "metadata": {}
+    }
+    state.update(profile_agent._execute_logic(state))
+
+    metrics.update(latency_metrics(
+        "agents.profile_intelligence.execute_logic",
+        time_calls(lambda: profile_agent._execute_logic(state), iterations),
+        unit="us"
+    ))
+    metrics.update(latency_metrics(
+        "agents.personalization.execute_logic",
+        time_calls(lambda: personalization_agent._execute_logic(state), iterations),
+        unit="us"
+    ))
+
+    orchestrator = LinkedIntelligenceOrchestrator()
+
+    async def run_workflows():
+        for index in range(iterations):
+            await orchestrator.process_profile(
+                user_id=f"bench-user-{index}",
+                profile_url=f"https://linkedin.com/in/bench-{index % 50}",
+                message_type="connection_request"
+            )
+
+    with quiet():
+        started = time.perf_counter()
+        asyncio.run(run_workflows())
+        elapsed = time.perf_counter() - started
+
+    metrics["agents.orchestrator.workflows_per_sec"] = metric(
+        iterations / elapsed, "workflows/s", higher_is_better=True
+    )
+    return metrics
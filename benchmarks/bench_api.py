@@ -0,0 +1,94 @@
+# benchmarks/bench_api.py
+"""In-process ASGI latency of analyze-profile and the profile listing under concurrency"""
+import asyncio
+import time
+from typing import Iterable, List
+
+import httpx
+
+from benchmarks.common import Metrics, latency_metrics, metric, quiet, reset_database
+
+async def _timed_requests(client, method: str, path: str, total: int, concurrency: int, **kwargs) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, path.format(index=index), **kwargs)
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(index) for index in range(total)))
+    return samples
+
+async def _run(total: int, concurrency_levels: Iterable[int]) -> Metrics:
+    from main import app
+    from models.base import SessionLocal
+    from models.user import User
+    from services.auth import create_access_token
+
+    reset_database()
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    metrics: Metrics = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for concurrency in concurrency_levels:
+            started = time.perf_counter()
+            samples = await _timed_requests(
+                client, "POST", "/api/agents/analyze-profile", total, concurrency,
+                json={"profile_url": "https://linkedin.com/in/bench-profile"}
+            )
+            elapsed = time.perf_counter() - started
+            label = f"api.analyze_profile.concurrency_{concurrency}"
+            metrics.update(latency_metrics(label, samples))
+            metrics[f"{label}.requests_per_sec"] = metric(total / elapsed, "req/s", higher_is_better=True)
+
+            started = time.perf_counter()
+            samples = await _timed_requests(client, "GET", "/api/profiles/", total, concurrency)
+            elapsed = time.perf_counter() - started
+            label = f"api.list_profiles.concurrency_{concurrency}"
+            metrics.update(latency_metrics(label, samples))
+            metrics[f"{label}.requests_per_sec"] = metric(total / elapsed, "req/s", higher_is_better=True)
+
+    return metrics
+
+async def _admission_overhead(iterations: int) -> Metrics:
+    """Time spent in AdmissionControl itself, around a no-op app (in-process limiter)"""
+    from api.middleware import AdmissionControl
+    from services.auth import create_access_token
+
+    async def noop_app(scope, receive, send):
+        pass
+
+    token = create_access_token({"sub": "bench@example.com", "tier": "enterprise"})
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/agents/analyze-profile",
+        "headers": [(b"authorization", f"Bearer {token}".encode())]
+    }
+
+    samples = {}
+    for label, app in (("bare", noop_app), ("admission", AdmissionControl(noop_app))):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await app(scope, None, None)
+            timings.append(time.perf_counter() - started)
+        samples[label] = timings
+
+    overhead = [with_admission - bare for with_admission, bare in zip(samples["admission"], samples["bare"])]
+    return latency_metrics("api.admission.overhead", overhead, unit="us")
+
+def run(total: int = 200, concurrency_levels: Iterable[int] = (1, 10, 50)) -> Metrics:
+    with quiet():
+        metrics = asyncio.run(_run(total, concurrency_levels))
+        # Stays under the enterprise burst, so every request is admitted
+        metrics.update(asyncio.run(_admission_overhead(iterations=400)))
+        return metrics
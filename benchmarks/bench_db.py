@@ -0,0 +1,71 @@
+# benchmarks/bench_db.py
+"""Profile listing query latency at increasing table sizes"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from benchmarks.common import Metrics, latency_metrics, reset_database, time_calls
+
+USERS = 10
+INSERT_BATCH = 10_000
+
+def _seed(row_count: int) -> uuid.UUID:
+    """Fill linkedin_profiles with row_count rows spread over USERS users; return one user id"""
+    from sqlalchemy import insert
+    from models.base import SessionLocal
+    from models.profile import LinkedInProfile
+    from models.user import User
+
+    reset_database()
+    user_ids = [uuid.uuid4() for _ in range(USERS)]
+    base_time = datetime(2024, 1, 1)
+
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"id": user_id, "email": f"bench-{index}@example.com", "hashed_password": "x"}
+            for index, user_id in enumerate(user_ids)
+        ])
+        for start in range(0, row_count, INSERT_BATCH):
+            db.execute(insert(LinkedInProfile), [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_ids[index % USERS],
+                    "linkedin_url": f"https://linkedin.com/in/bench-{index}",
+                    "profile_data": {
+                        "name": f"Bench Person {index}",
+                        "title": "Software Engineer",
+                        "experience": [{"company": f"Company {index % 500}"}]
+                    },
+                    "ai_insights": {"message_tone": "professional"},
+                    "engagement_score": (index % 100) / 100,
+                    "last_analyzed": base_time + timedelta(seconds=index),
+                    "created_at": base_time + timedelta(seconds=index)
+                }
+                for index in range(start, min(start + INSERT_BATCH, row_count))
+            ])
+        db.commit()
+
+    return user_ids[0]
+
+def run(row_counts: Iterable[int] = (10_000, 100_000, 1_000_000), iterations: int = 50) -> Metrics:
+    from models.base import SessionLocal
+    from models.profile import LinkedInProfile
+
+    metrics: Metrics = {}
+    for row_count in row_counts:
+        user_id = _seed(row_count)
+        per_user = row_count // USERS
+
+        def list_page(skip: int):
+            with SessionLocal() as db:
+                return db.query(LinkedInProfile).filter(
+                    LinkedInProfile.user_id == user_id
+                ).offset(skip).limit(100).all()
+
+        label = f"db.list_profiles.rows_{row_count}"
+        metrics.update(latency_metrics(f"{label}.first_page", time_calls(lambda: list_page(0), iterations)))
+        metrics.update(latency_metrics(
+            f"{label}.last_page",
+            time_calls(lambda: list_page(max(per_user - 100, 0)), iterations)
+        ))
+    return metrics
@@ -0,0 +1,68 @@
+# benchmarks/common.py
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Benchmarks run offline: a throwaway SQLite file unless a database is given explicitly,
+# configured before any backend module creates its engine
+BENCH_DIR = tempfile.mkdtemp(prefix="linkedintelligence-bench-")
+os.environ.setdefault("BENCH_DATABASE_URL", f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("PREWARM_AGENTS", "false")
+os.environ.setdefault("CHECKPOINT_URL", "memory")
+# Throughput runs hammer one user; admission overhead is measured separately
+os.environ.setdefault("ADMISSION_CONTROL", "false")
+
+Metrics = Dict[str, Dict[str, object]]
+
+def metric(value: float, unit: str, higher_is_better: bool = False) -> Dict[str, object]:
+    return {"value": round(value, 3), "unit": unit, "higher_is_better": higher_is_better}
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+def latency_metrics(prefix: str, samples_seconds: List[float], unit: str = "ms") -> Metrics:
+    """p50/p95/mean of latency samples, scaled to ms or us"""
+    scale = 1000 if unit == "ms" else 1_000_000
+    samples = [sample * scale for sample in samples_seconds]
+    return {
+        f"{prefix}.p50": metric(percentile(samples, 50), unit),
+        f"{prefix}.p95": metric(percentile(samples, 95), unit),
+        f"{prefix}.mean": metric(statistics.fmean(samples), unit)
+    }
+
+def time_calls(fn: Callable[[], object], iterations: int, warmup: int = 5) -> List[float]:
+    """Wall-clock duration of each call, after a short warmup"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the agents' per-run print statements while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def reset_database():
+    """Recreate all tables in the benchmark database"""
+    import models  # noqa: F401  registers every table on Base.metadata
+    from models.base import Base, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
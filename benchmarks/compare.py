@@ -0,0 +1,32 @@
+# benchmarks/compare.py
+from typing import Dict, List
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.15) -> List[Dict]:
+    """Per-metric change against a baseline; regressions are changes worse than threshold"""
+    rows = []
+    for name, result in sorted(current["metrics"].items()):
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None or not previous["value"]:
+            continue
+
+        change = (result["value"] - previous["value"]) / previous["value"]
+        worse = -change if result["higher_is_better"] else change
+        rows.append({
+            "metric": name,
+            "baseline": previous["value"],
+            "current": result["value"],
+            "unit": result["unit"],
+            "change": round(change, 3),
+            "regression": worse > threshold
+        })
+    return rows
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'metric':<62} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['metric']:<62} {row['baseline']:>12} {row['current']:>12} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
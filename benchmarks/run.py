@@ -0,0 +1,101 @@
+# benchmarks/run.py
+"""Offline performance benchmarks: agents, API routes (in-process ASGI) and DB paths
+
+Usage (from the repository root):
+    python -m benchmarks.run --output bench_results.json
+    python -m benchmarks.run --quick --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+With --baseline, exits non-zero when any metric is worse than --threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+from benchmarks import common  # noqa: F401  configures the offline database first
+from benchmarks.compare import compare_results, format_comparison
+
+SUITES = ("agents", "api", "db", "memory")
+
+def run_suites(suites, quick: bool, row_counts) -> dict:
+    from benchmarks import bench_agents, bench_api, bench_db, state_memory
+
+    metrics = {}
+    timings = {}
+    for suite in suites:
+        started = time.perf_counter()
+        print(f"Running {suite} benchmarks...", file=sys.stderr)
+        if suite == "agents":
+            metrics.update(bench_agents.run(iterations=100 if quick else 500))
+        elif suite == "api":
+            metrics.update(bench_api.run(
+                total=50 if quick else 200,
+                concurrency_levels=(1, 10) if quick else (1, 10, 50)
+            ))
+        elif suite == "db":
+            metrics.update(bench_db.run(row_counts=row_counts, iterations=20 if quick else 50))
+        elif suite == "memory":
+            metrics.update(state_memory.run(batch_size=1000))
+        timings[suite] = round(time.perf_counter() - started, 2)
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "suite_seconds": timings
+        },
+        "metrics": metrics
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", default=",".join(SUITES), help="Comma-separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations and only 10k DB rows")
+    parser.add_argument("--rows", default=None, help="Comma-separated listing table sizes (default 10000,100000,1000000)")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", default=None, help="Write results JSON as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    suites = [suite.strip() for suite in args.suite.split(",") if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    if args.rows:
+        row_counts = [int(rows) for rows in args.rows.split(",")]
+    else:
+        row_counts = [10_000] if args.quick else [10_000, 100_000, 1_000_000]
+
+    results = run_suites(suites, args.quick, row_counts)
+    payload = json.dumps(results, indent=2)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(payload + "\n")
+
+    if not args.baseline:
+        print(payload)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    rows = compare_results(baseline, results, threshold=args.threshold)
+    print(format_comparison(rows))
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
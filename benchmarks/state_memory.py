@@ -0,0 +1,144 @@
+# benchmarks/state_memory.py
+"""Per-workflow memory of the legacy dict-copied state vs. the compact delta state
+
+The legacy side runs the agents as they were before delta-returning nodes,
+imported from git history, so the comparison is against the real old code.
+
+Usage: python -m benchmarks.state_memory [--batch-size 1000] [--unique-profiles 100] [--legacy-rev REV]
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.common import BACKEND_DIR, Metrics, metric, quiet
+from agents.profile_intelligence import ProfileIntelligenceAgent
+from agents.personalization import PersonalizationAgent
+
+# Last commit whose agents copied and returned the whole state from every node
+LEGACY_AGENTS_REV = "2f53bbe"
+
+def load_legacy_agents(rev: str = LEGACY_AGENTS_REV):
+    """Import backend/agents as of rev as the legacy_agents package; returns its agent classes"""
+    repo_dir = os.path.dirname(BACKEND_DIR)
+
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], cwd=repo_dir, capture_output=True, text=True, check=True).stdout
+
+    package_dir = os.path.join(tempfile.mkdtemp(prefix="legacy-agents-"), "legacy_agents")
+    os.mkdir(package_dir)
+    open(os.path.join(package_dir, "__init__.py"), "w").close()
+    for path in git("ls-tree", "--name-only", rev, "backend/agents/").split():
+        if path.endswith(".py"):
+            with open(os.path.join(package_dir, os.path.basename(path)), "w") as module:
+                module.write(git("show", f"{rev}:{path}"))
+
+    sys.modules.pop("legacy_agents", None)
+    sys.path.insert(0, os.path.dirname(package_dir))
+    try:
+        profile_module = importlib.import_module("legacy_agents.profile_intelligence")
+        personalization_module = importlib.import_module("legacy_agents.personalization")
+    finally:
+        sys.path.remove(os.path.dirname(package_dir))
+    return profile_module.ProfileIntelligenceAgent, personalization_module.PersonalizationAgent
+
+def initial_state(index: int, unique_profiles: int) -> dict:
+    return {
+        "user_id": f"bench-user-{index}",
+        "profile_url": f"https://linkedin.com/in/bench-{index % unique_profiles}",
+        "message_type": "connection_request",
+        "message_types": ["connection_request"],
+        "profile_data": None,
+        "ai_insights": None,
+        "engagement_score": None,
+        "personalized_messages": None,
+        "selected_messages": None,
+        "selected_message": None,
+        "current_step": "initialized",
+        "next_action": "analyze_profile",
+        "errors": [],
+        "metadata": {"workflow_id": f"bench-{index}"}
+    }
+
+def legacy_initial_state(index: int, unique_profiles: int) -> dict:
+    """The state keys the legacy workflow started from"""
+    state = initial_state(index, unique_profiles)
+    for key in ("message_types", "selected_messages"):
+        del state[key]
+    state["message_templates"] = None
+    return state
+
+def run_legacy(state: dict, profile_agent, personalization_agent) -> dict:
+    """Run the legacy agents; LangGraph handed each node a copy of the state and stored all it returned"""
+    for agent in (profile_agent, personalization_agent):
+        state = agent.execute(dict(state))
+    return state
+
+def run_compact(state: dict, profile_agent, personalization_agent) -> dict:
+    """Run the real agents and merge their deltas the way LangGraph channels do"""
+    for agent in (profile_agent, personalization_agent):
+        delta = agent.execute(state)
+        state = dict(state)
+        for key, value in delta.items():
+            state[key] = state[key] + value if key == "errors" else value
+    # The orchestrator's join node picks the primary type's selection
+    state["selected_message"] = state["selected_messages"].get(state["message_type"])
+    return state
+
+def measure(run, agents, make_state, batch_size: int, unique_profiles: int) -> dict:
+    """Allocation per workflow while a whole batch of results is held"""
+    profile_agent_class, personalization_agent_class = agents
+    profile_agent = profile_agent_class()
+    personalization_agent = personalization_agent_class()
+    states = [make_state(index, unique_profiles) for index in range(batch_size)]
+
+    gc.collect()
+    tracemalloc.start()
+    with quiet():
+        results = [run(state, profile_agent, personalization_agent) for state in states]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(results) == batch_size
+    return {
+        "retained_bytes_per_workflow": round(retained / batch_size, 1),
+        "peak_bytes_per_workflow": round(peak / batch_size, 1)
+    }
+
+def run_benchmark(batch_size: int = 1000, unique_profiles: int = 100, legacy_rev: str = LEGACY_AGENTS_REV) -> dict:
+    legacy = measure(run_legacy, load_legacy_agents(legacy_rev), legacy_initial_state, batch_size, unique_profiles)
+    compact = measure(
+        run_compact, (ProfileIntelligenceAgent, PersonalizationAgent), initial_state, batch_size, unique_profiles
+    )
+    return {
+        "batch_size": batch_size,
+        "unique_profiles": unique_profiles,
+        "legacy_rev": legacy_rev,
+        "legacy": legacy,
+        "compact": compact,
+        "retained_reduction": round(
+            1 - compact["retained_bytes_per_workflow"] / legacy["retained_bytes_per_workflow"], 3
+        )
+    }
+
+def run(batch_size: int = 1000, unique_profiles: int = 100) -> Metrics:
+    result = run_benchmark(batch_size, unique_profiles)
+    return {
+        f"memory.{variant}.{key}": metric(value, "bytes")
+        for variant in ("legacy", "compact")
+        for key, value in result[variant].items()
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--unique-profiles", type=int, default=100)
+    parser.add_argument("--legacy-rev", default=LEGACY_AGENTS_REV, help="Git revision of the legacy agents")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.batch_size, args.unique_profiles, args.legacy_rev), indent=2))
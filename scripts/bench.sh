@@ -0,0 +1,6 @@
+# scripts/bench.sh
+#!/bin/bash
+echo "Running LinkedIntelligence Benchmarks..."
+
+# Offline: SQLite + in-process ASGI. Pass e.g. --quick, --baseline benchmarks/baseline.json
+python -m benchmarks.run --output bench_results.json "$@"
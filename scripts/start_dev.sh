@@ -11,6 +11,7 @@ sleep 5
 # Run database migrations
 cd backend
 alembic upgrade head
+python backfill_embeddings.py
 
 # Start the API server
 python main.py
\ No newline at end of file
@@ -2,5 +2,4 @@
 #!/bin/bash
 echo "Running LinkedIntelligence Tests..."
 
-cd backend
-pytest tests/ -v --cov=. --cov-report=html
\ No newline at end of file
+pytest tests/ -v --cov=backend --cov-report=html
@@ -0,0 +1,15 @@
+# tests/conftest.py
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Backend modules import each other as top-level packages (models, services, api);
+# the repo root makes the benchmarks package importable under plain `pytest`
+BACKEND_DIR = os.path.join(REPO_DIR, "backend")
+for path in (REPO_DIR, BACKEND_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CHECKPOINT_URL", "memory")
@@ -0,0 +1,140 @@
+# tests/test_admission.py
+import asyncio
+import time
+
+import pytest
+
+from api.middleware import AdmissionControl
+from services import admission
+from services.admission import AdmissionController, LocalAdmission
+from services.auth import create_access_token
+
+def test_local_token_bucket_rejects_after_burst():
+    limiter = LocalAdmission()
+    burst = admission.TIER_LIMITS["free"].burst
+
+    decisions = [limiter.acquire("free@example.com", "free", False, str(i)) for i in range(burst + 1)]
+
+    assert all(decision.allowed for decision in decisions[:burst])
+    assert not decisions[-1].allowed
+    assert decisions[-1].reason == "rate_limited"
+    assert 0 < decisions[-1].retry_after <= 1.0
+
+    # Buckets are per caller
+    assert limiter.acquire("other@example.com", "free", False, "x").allowed
+
+def test_local_workflow_caps_and_release():
+    limiter = LocalAdmission(max_inflight=2)
+
+    assert limiter.acquire("a@example.com", "free", True, "a1").allowed
+    capped = limiter.acquire("a@example.com", "free", True, "a2")
+    assert (capped.allowed, capped.reason) == (False, "too_many_workflows")
+
+    assert limiter.acquire("b@example.com", "pro", True, "b1").allowed
+    shed = limiter.acquire("c@example.com", "enterprise", True, "c1")
+    assert (shed.allowed, shed.reason) == (False, "overloaded")
+
+    limiter.release("a@example.com", "a1")
+    assert limiter.acquire("a@example.com", "free", True, "a3").allowed
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local_limits(monkeypatch):
+    class BrokenRedis:
+        def register_script(self, script):
+            async def run(**kwargs):
+                raise ConnectionError("redis down")
+            return run
+    
+    monkeypatch.setattr(admission, "get_async_redis", lambda: BrokenRedis())
+    controller = AdmissionController(local=LocalAdmission())
+    
+    assert (await controller.acquire("a@example.com", "free", True, "a1")).allowed
+    assert not (await controller.acquire("a@example.com", "free", True, "a2")).allowed
+    await controller.release("a@example.com", "a1")
+    assert (await controller.acquire("a@example.com", "free", True, "a3")).allowed
+
+@pytest.mark.asyncio
+async def test_slow_redis_does_not_serialize_requests(monkeypatch):
+    """Admission awaits Redis, so concurrent requests overlap their round trips"""
+    
+    class SlowRedis:
+        def register_script(self, script):
+            async def run(**kwargs):
+                await asyncio.sleep(0.05)
+                return [1, 0, b"ok"]
+            return run
+    
+    monkeypatch.setattr(admission, "get_async_redis", lambda: SlowRedis())
+    
+    async def app(scope, receive, send):
+        pass
+    
+    middleware = AdmissionControl(app, controller=AdmissionController(local=LocalAdmission()))
+    token = create_access_token({"sub": "pro@example.com", "tier": "pro"})
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        middleware(_scope(token, path="/api/profiles/", method="GET"), None, None) for _ in range(20)
+    ))
+    
+    # Twenty sequential round trips would take a second
+    assert time.perf_counter() - started < 0.5
+
+def _scope(token, path="/api/agents/analyze-profile", method="POST"):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"authorization", f"Bearer {token}".encode())]
+    }
+
+@pytest.mark.asyncio
+async def test_middleware_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(admission, "get_async_redis", lambda: None)
+    release = asyncio.Event()
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await release.wait()
+
+    middleware = AdmissionControl(app, controller=AdmissionController(local=LocalAdmission()))
+    token = create_access_token({"sub": "free@example.com", "tier": "free"})
+
+    running = asyncio.create_task(middleware(_scope(token), None, None))
+    await asyncio.sleep(0)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(_scope(token), None, send)
+    headers = dict(sent[0]["headers"])
+    assert sent[0]["status"] == 429
+    assert headers[b"retry-after"] == b"2"
+    assert b"too_many_workflows" in sent[1]["body"]
+
+    # Non-workflow requests are only rate limited
+    release.set()
+    await middleware(_scope(token, path="/api/profiles/", method="GET"), None, send)
+    await running
+    assert calls == ["/api/agents/analyze-profile", "/api/profiles/"]
+
+    # The finished workflow freed its slot
+    await middleware(_scope(token), None, send)
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_middleware_passes_through_without_valid_token():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+
+    middleware = AdmissionControl(app, controller=AdmissionController(local=LocalAdmission(max_inflight=0)))
+
+    await middleware(_scope("not-a-jwt"), None, None)
+    await middleware({"type": "http", "method": "POST", "path": "/auth/login", "headers": []}, None, None)
+
+    assert calls == ["/api/agents/analyze-profile", "/auth/login"]
@@ -1,7 +1,7 @@
 # tests/test_agents.py
 import pytest
-from backend.agents.orchestrator import LinkedIntelligenceOrchestrator
-from backend.agents.base import LinkedIntelligenceState
+from agents.orchestrator import LinkedIntelligenceOrchestrator
+from agents.base import LinkedIntelligenceState
 
 @pytest.mark.asyncio
 async def test_profile_analysis_workflow():
@@ -29,7 +29,7 @@ async def test_profile_analysis_workflow():
 async def test_profile_intelligence_agent():
     """Test profile intelligence agent individually"""
     
-    from backend.agents.profile_intelligence import ProfileIntelligenceAgent
+    from agents.profile_intelligence import ProfileIntelligenceAgent
     
     agent = ProfileIntelligenceAgent()
     
@@ -55,4 +55,323 @@ async def test_profile_intelligence_agent():
     assert result["ai_insights"] is not None
     assert result["engagement_score"] > 0
 
-# Run tests with: pytest tests/ -v
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_failed_workflow_resumes_from_checkpoint(tmp_path):
+    """A retried workflow skips nodes that already completed"""
+    
+    from agents.checkpoint import build_checkpointer
+    
+    orchestrator = LinkedIntelligenceOrchestrator(
+        checkpointer=build_checkpointer(f"sqlite:///{tmp_path / 'checkpoints.sqlite'}")
+    )
+    personalize = orchestrator.personalization_agent._execute_logic
+    
+    def fail_once(state):
+        orchestrator.personalization_agent._execute_logic = personalize
+        raise RuntimeError("model timeout")
+    
+    orchestrator.personalization_agent._execute_logic = fail_once
+    
+    failed = await orchestrator.process_profile(
+        user_id="test-user-123",
+        profile_url="https://linkedin.com/in/test-profile"
+    )
+    assert failed["current_step"] == "error_handled"
+    assert failed["errors"] == ["PersonalizationAgent: model timeout"]
+    
+    workflow_id = failed["metadata"]["workflow_id"]
+    result = await orchestrator.resume_workflow(workflow_id)
+    
+    assert result["errors"] == []
+    assert result["selected_message"] is not None
+    # fetch, insights, scoring and embedding each ran once
+    assert orchestrator.profile_agent.execution_count == 3
+    assert orchestrator.embedding_agent.execution_count == 1
+    assert len(result["profile_embedding"]) == 4 * 256
+    assert orchestrator.personalization_agent.execution_count == 2
+
+@pytest.mark.asyncio
+async def test_message_types_generated_in_parallel_branches():
+    """Each requested message type gets its own personalization branch"""
+    
+    orchestrator = LinkedIntelligenceOrchestrator()
+    
+    result = await orchestrator.process_profile(
+        user_id="test-user-123",
+        profile_url="https://linkedin.com/in/test-profile",
+        message_type="connection_request",
+        message_types=["follow_up", "connection_request"]
+    )
+    
+    assert result["errors"] == []
+    assert result["message_types"] == ["connection_request", "follow_up"]
+    assert {message.message_type for message in result["personalized_messages"]} == {"connection_request", "follow_up"}
+    assert set(result["selected_messages"]) == {"connection_request", "follow_up"}
+    assert result["selected_message"] == result["selected_messages"]["connection_request"]
+    assert orchestrator.personalization_agent.execution_count == 2
+
+@pytest.mark.asyncio
+async def test_profile_cache_expires_and_refresh_refetches(monkeypatch):
+    """Cached profiles expire after their TTL, and refresh=True fetches again at once"""
+    
+    from agents import profile_cache
+    
+    clock = [1000.0]
+    monkeypatch.setattr(profile_cache.time, "monotonic", lambda: clock[0])
+    
+    orchestrator = LinkedIntelligenceOrchestrator()
+    agent = orchestrator.profile_agent
+    agent.profile_cache = profile_cache.ProfileBlobCache(ttl_seconds=60)
+    fetch = agent._fetch_profile
+    fetched = []
+    agent._fetch_profile = lambda url: fetched.append(url) or fetch(url)
+    
+    for message_type in ("connection_request", "follow_up"):
+        await orchestrator.process_profile(
+            user_id="test-user-123",
+            profile_url="https://linkedin.com/in/test-profile",
+            message_type=message_type
+        )
+    assert len(fetched) == 1
+    
+    await orchestrator.process_profile(
+        user_id="test-user-123",
+        profile_url="https://www.linkedin.com/in/Test-Profile/",
+        message_type="connection_request",
+        message_types=["follow_up"],
+        refresh=True
+    )
+    assert len(fetched) == 2
+    
+    clock[0] += 61
+    assert agent.profile_cache.get("https://linkedin.com/in/test-profile") is None
+    assert len(agent.profile_cache) == 0
+
+@pytest.fixture
+def message_users():
+    """Two users on the in-memory database, so tenant scoping can be checked"""
+    
+    import uuid
+    from models.base import Base, SessionLocal, engine
+    from models.user import User
+    
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    users = [User(email=f"{uuid.uuid4()}@example.com", hashed_password="x") for _ in range(2)]
+    db.add_all(users)
+    db.commit()
+    yield db, users
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+async def _analyze_and_store(db, user):
+    from api.agents import _persist_result
+    
+    orchestrator = LinkedIntelligenceOrchestrator()
+    result = await orchestrator.process_profile(
+        user_id=str(user.id),
+        profile_url="https://linkedin.com/in/test-profile",
+        message_type="connection_request",
+        message_types=["connection_request", "follow_up"]
+    )
+    return _persist_result(db, user, "https://linkedin.com/in/test-profile", "connection_request", result)
+
+@pytest.mark.asyncio
+async def test_generated_messages_are_stored_and_reserved(message_users):
+    """Every variant is stored once and re-served without rerunning the workflow"""
+    
+    import uuid
+    from fastapi import HTTPException
+    from api.agents import get_profile_messages
+    
+    db, (user, other) = message_users
+    response = await _analyze_and_store(db, user)
+    profile_id = uuid.UUID(response["profile_id"])
+    
+    stored = await get_profile_messages(profile_id, current_user=user, db=db, fields=None)
+    
+    assert sorted(message["id"] for message in stored["messages"]) == sorted(response["message_ids"])
+    assert stored["selected_message"]["is_selected"]
+    assert stored["selected_message"]["content"] in {
+        message.content for message in response["analysis"]["selected_messages"].values()
+    }
+    assert {message["message_type"] for message in stored["messages"] if message["is_selected"]} == {
+        "connection_request", "follow_up"
+    }
+    
+    follow_ups = await get_profile_messages(
+        profile_id, message_type="follow_up", current_user=user, db=db, fields=None
+    )
+    assert {message["message_type"] for message in follow_ups["messages"]} == {"follow_up"}
+    
+    # Another user cannot read them
+    with pytest.raises(HTTPException) as error:
+        await get_profile_messages(profile_id, current_user=other, db=db, fields=None)
+    assert error.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_record_message_outcome(message_users):
+    """POST /messages/{id}/outcome stores the outcome for the owner only"""
+    
+    from fastapi import HTTPException
+    from api.agents import record_message_outcome
+    
+    db, (user, other) = message_users
+    response = await _analyze_and_store(db, user)
+    message_id = response["message_ids"][0]
+    
+    recorded = await record_message_outcome(message_id, {"outcome": "replied"}, current_user=user, db=db)
+    assert recorded["id"] == message_id
+    assert recorded["outcome"] == "replied"
+    assert recorded["outcome_at"] is not None
+    
+    with pytest.raises(HTTPException) as error:
+        await record_message_outcome(message_id, {"outcome": "maybe"}, current_user=user, db=db)
+    assert error.value.status_code == 400
+    
+    with pytest.raises(HTTPException) as error:
+        await record_message_outcome(message_id, {"outcome": "ignored"}, current_user=other, db=db)
+    assert error.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_best_templates_are_per_user_and_ignore_pending(message_users):
+    """Template stats only count the user's own resolved outcomes"""
+    
+    from api.agents import record_message_outcome
+    from services.messages import best_templates_by_industry
+    
+    db, (user, other) = message_users
+    mine = await _analyze_and_store(db, user)
+    theirs = await _analyze_and_store(db, other)
+    
+    await record_message_outcome(mine["message_ids"][0], {"outcome": "replied"}, current_user=user, db=db)
+    await record_message_outcome(mine["message_ids"][1], {"outcome": "sent"}, current_user=user, db=db)
+    for message_id in theirs["message_ids"]:
+        await record_message_outcome(message_id, {"outcome": "ignored"}, current_user=other, db=db)
+    
+    message_type = mine["analysis"]["personalized_messages"][0].message_type
+    best = best_templates_by_industry(db, user.id, message_type)
+    
+    assert len(best) == 1
+    assert best[0]["resolved"] == 1
+    assert best[0]["positive"] == 1
+    assert all(row["positive"] == 0 for row in best_templates_by_industry(db, other.id, message_type))
+
+@pytest.mark.asyncio
+async def test_analysis_rollup_counts_every_message_type(message_users):
+    """An analysis generating several message types counts each of them once"""
+    
+    from services.analytics import MESSAGE_TYPE, get_top_buckets
+    
+    db, (user, _) = message_users
+    await _analyze_and_store(db, user)
+    
+    counts = {row["name"]: row["count"] for row in get_top_buckets(db, user.id, MESSAGE_TYPE, 10)}
+    assert counts == {"connection_request": 1, "follow_up": 1}
+
+def test_analyze_request_only_accepts_known_message_types():
+    """The request schema's message types are exactly the ones with templates"""
+    
+    from typing import get_args
+    from pydantic import ValidationError
+    from agents.personalization import PersonalizationAgent
+    from schemas.agents import AnalyzeProfileRequest, MessageType
+    
+    assert set(get_args(MessageType)) == set(PersonalizationAgent().message_templates)
+    
+    request = AnalyzeProfileRequest(profile_url="https://linkedin.com/in/x", message_types=["follow_up"])
+    assert request.message_type == "connection_request"
+    
+    with pytest.raises(ValidationError):
+        AnalyzeProfileRequest(profile_url="https://linkedin.com/in/x", message_types=["follow_up", "cold_email"])
+
+@pytest.mark.asyncio
+async def test_failed_analysis_is_not_saved_until_resumed(message_users):
+    """A run that ends in the error handler writes nothing; its resume saves the analysis once"""
+    
+    from fastapi import HTTPException, Response
+    from api.agents import analyze_profile, get_orchestrator, resume_workflow
+    from models.profile import LinkedInProfile
+    from schemas.agents import AnalyzeProfileRequest
+    from services.analytics import MESSAGE_TYPE, get_top_buckets
+    
+    db, (user, _) = message_users
+    agent = get_orchestrator().personalization_agent
+    personalize = agent._execute_logic
+    
+    def fail(state):
+        raise RuntimeError("model timeout")
+    
+    async def analyze(url):
+        return await analyze_profile(
+            AnalyzeProfileRequest(profile_url=url),
+            Response(),
+            fields=None,
+            idempotency_key=None,
+            current_user=user,
+            db=db
+        )
+    
+    agent._execute_logic = fail
+    try:
+        with pytest.raises(HTTPException) as error:
+            await analyze("https://linkedin.com/in/flaky-resume")
+    finally:
+        agent._execute_logic = personalize
+    assert error.value.status_code == 500
+    assert error.value.detail["errors"] == ["PersonalizationAgent: model timeout"]
+    assert db.query(LinkedInProfile).count() == 0
+    
+    response = await resume_workflow(error.value.detail["workflow_id"], fields=None, current_user=user, db=db)
+    assert response["status"] == "success"
+    assert db.query(LinkedInProfile).count() == 1
+    assert get_top_buckets(db, user.id, MESSAGE_TYPE, 10)[0]["count"] == 1
+    
+    # Retrying the request instead of resuming picks up the checkpoint the same way
+    agent._execute_logic = fail
+    try:
+        with pytest.raises(HTTPException):
+            await analyze("https://linkedin.com/in/flaky-retry")
+    finally:
+        agent._execute_logic = personalize
+    await analyze("https://linkedin.com/in/flaky-retry")
+    assert db.query(LinkedInProfile).count() == 2
+    assert get_top_buckets(db, user.id, MESSAGE_TYPE, 10)[0]["count"] == 2
+
+# Run tests with: pytest tests/ -v
+@pytest.mark.asyncio
+async def test_idempotency_key_is_rejected_for_a_different_request(message_users):
+    """A retry with the same key replays the response; a different body under that key is a 422"""
+    
+    from fastapi import HTTPException, Response
+    from api.agents import analyze_profile
+    from models.profile import LinkedInProfile
+    from schemas.agents import AnalyzeProfileRequest
+    
+    db, (user, _) = message_users
+    
+    async def analyze(request, key="retry-1"):
+        response = Response()
+        payload = await analyze_profile(
+            request,
+            response,
+            fields=None,
+            idempotency_key=key,
+            current_user=user,
+            db=db
+        )
+        return payload, response
+    
+    request = AnalyzeProfileRequest(profile_url="https://linkedin.com/in/idempotent")
+    first, _ = await analyze(request)
+    replay, response = await analyze(AnalyzeProfileRequest(profile_url=request.profile_url, message_type="connection_request"))
+    assert replay["profile_id"] == str(first["profile_id"])
+    assert replay["message_ids"] == first["message_ids"]
+    assert response.headers["Idempotent-Replayed"] == "true"
+    
+    with pytest.raises(HTTPException) as error:
+        await analyze(AnalyzeProfileRequest(profile_url=request.profile_url, message_types=["follow_up"]))
+    assert error.value.status_code == 422
+    with pytest.raises(HTTPException):
+        await analyze(AnalyzeProfileRequest(profile_url="https://linkedin.com/in/someone-else"))
+    assert db.query(LinkedInProfile).count() == 1
@@ -0,0 +1,98 @@
+# tests/test_bandit.py
+from agents.bandit import ThompsonSamplingSelector
+
+def test_selector_learns_from_outcomes():
+    """Test Thompson sampling converges on the template that gets replies"""
+    
+    selector = ThompsonSamplingSelector()
+    selector._random.seed(7)
+    
+    for _ in range(200):
+        selector.update("connection_request", 2, "tech", reward=True)
+        selector.update("connection_request", 0, "tech", reward=False)
+    
+    picks = [selector.select("connection_request", "tech", [0, 1, 2]) for _ in range(100)]
+    
+    assert picks.count(2) > 90
+    assert selector.expected_rate("connection_request", 2, "tech") > 0.95
+    # Other industries keep their own, untouched posteriors
+    assert selector.expected_rate("connection_request", 2, "finance") == 0.5
+
+def test_selector_snapshot_round_trip():
+    selector = ThompsonSamplingSelector()
+    selector.update("follow_up", 1, "tech", reward=True)
+    selector.load_counts([("connection_request", 0, "professional", 3, 1)])
+    selector.update("follow_up", 1, "tech", reward=False)
+    
+    restored = ThompsonSamplingSelector()
+    restored.restore(selector.snapshot())
+    
+    assert len(restored) == 2
+    assert restored.expected_rate("connection_request", 0, "professional") == 4 / 6
+    assert restored.expected_rate("follow_up", 1, "tech") == 1 / 3
+
+def test_snapshot_store_rebuilds_from_outcomes_across_workers(monkeypatch):
+    """Workers refresh from generated_messages; snapshots are only a per-version cache"""
+    
+    import uuid
+    from datetime import datetime
+    
+    from models.base import Base, SessionLocal, engine
+    from models.message import GeneratedMessage
+    from services import bandit_store
+    from services.bandit_store import BanditSnapshotStore
+    
+    class FakeRedis:
+        def __init__(self):
+            self.values = {}
+        
+        def set(self, key, value, ex=None):
+            self.values[key] = value
+        
+        def get(self, key):
+            return self.values.get(key)
+    
+    redis = FakeRedis()
+    monkeypatch.setattr(bandit_store, "get_redis", lambda: redis)
+    monkeypatch.setattr(bandit_store, "SNAPSHOT_INTERVAL_SECONDS", 0)
+    
+    def add_outcome(outcome):
+        db.add(GeneratedMessage(
+            profile_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            message_type="connection_request",
+            industry="tech",
+            template_id=1,
+            content="Hi",
+            content_hash="x",
+            outcome=outcome,
+            outcome_at=datetime.utcnow()
+        ))
+        db.commit()
+    
+    Base.metadata.create_all(bind=engine)
+    try:
+        with SessionLocal() as db:
+            worker_a = BanditSnapshotStore(ThompsonSamplingSelector())
+            worker_b = BanditSnapshotStore(ThompsonSamplingSelector())
+            
+            # Each worker records an outcome the other has not seen in memory
+            add_outcome("replied")
+            worker_a.selector.update("connection_request", 1, "tech", reward=True)
+            add_outcome("ignored")
+            worker_b.selector.update("connection_request", 1, "tech", reward=False)
+            
+            worker_a.ensure_loaded(db)
+            worker_b.ensure_loaded(db)
+            
+            for worker in (worker_a, worker_b):
+                assert worker.selector.expected_rate("connection_request", 1, "tech") == 2 / 4
+            assert len(redis.values) == 1
+            
+            # A new outcome changes the version, so the cached snapshot is not reused
+            add_outcome("replied")
+            worker_b.ensure_loaded(db)
+            assert worker_b.selector.expected_rate("connection_request", 1, "tech") == 3 / 5
+            assert len(redis.values) == 2
+    finally:
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,23 @@
+# tests/test_benchmarks.py
+from benchmarks.compare import compare_results
+
+def _results(**metrics):
+    return {
+        "metrics": {
+            name: {"value": value, "unit": "ms", "higher_is_better": name.endswith("per_sec")}
+            for name, value in metrics.items()
+        }
+    }
+
+def test_compare_flags_regressions_in_the_right_direction():
+    """Test latency increases and throughput drops beyond the threshold are regressions"""
+    
+    baseline = _results(latency_p50=10.0, workflows_per_sec=100.0, steady_p50=5.0, new_only=None)
+    current = _results(latency_p50=12.0, workflows_per_sec=80.0, steady_p50=5.2, added_metric=1.0)
+    
+    rows = {row["metric"]: row for row in compare_results(baseline, current, threshold=0.15)}
+    
+    assert rows["latency_p50"]["regression"]
+    assert rows["workflows_per_sec"]["regression"]
+    assert not rows["steady_p50"]["regression"]
+    assert "added_metric" not in rows
@@ -0,0 +1,97 @@
+# tests/test_export.py
+import csv
+import io
+import uuid
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from models.base import Base, SessionLocal, engine
+from models.profile import LinkedInProfile
+from models.user import User
+from services import export as profile_export
+
+START = datetime(2026, 1, 1)
+
+@pytest.fixture
+def user_id():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+        other = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+        db.add_all([user, other])
+        db.flush()
+        for index in range(5):
+            db.add(LinkedInProfile(
+                user_id=user.id,
+                linkedin_url=f"https://linkedin.com/in/p{index}",
+                profile_data={
+                    "name": f"Person {index}",
+                    "title": "Software Engineer",
+                    "experience": [{"company": "TechCorp"}]
+                },
+                ai_insights={"message_tone": "professional"},
+                engagement_score=index / 10,
+                last_analyzed=START + timedelta(days=index),
+                created_at=START
+            ))
+        db.add(LinkedInProfile(user_id=other.id, linkedin_url="https://linkedin.com/in/x", profile_data={}))
+        db.commit()
+        yield user.id
+    Base.metadata.drop_all(bind=engine)
+
+def _batches(user_id, since=None, batch_size=2):
+    return profile_export.iter_profile_batches(
+        user_id, since, "last_analyzed", until=START + timedelta(days=30), batch_size=batch_size
+    )
+
+def test_batches_stream_in_order_with_since(user_id):
+    batches = list(_batches(user_id))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [row["name"] for batch in batches for row in batch] == [f"Person {i}" for i in range(5)]
+
+    incremental = [row for batch in _batches(user_id, since=START + timedelta(days=2)) for row in batch]
+    assert [row["linkedin_url"] for row in incremental] == ["https://linkedin.com/in/p3", "https://linkedin.com/in/p4"]
+
+def test_csv_and_ndjson_encoding(user_id):
+    rows = list(csv.DictReader(io.StringIO(b"".join(profile_export.encode_csv(_batches(user_id))).decode())))
+    assert len(rows) == 5
+    assert rows[0]["company"] == "TechCorp"
+    assert rows[0]["industry"] == "tech"
+    assert orjson.loads(rows[0]["ai_insights"]) == {"message_tone": "professional"}
+
+    lines = b"".join(profile_export.encode_ndjson(_batches(user_id))).splitlines()
+    assert len(lines) == 5
+    assert orjson.loads(lines[-1])["engagement_score"] == 0.4
+
+    assert b"".join(profile_export.encode_csv(iter([]))).decode().strip() == ",".join(profile_export.COLUMNS)
+
+def test_parquet_row_groups(user_id):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = b"".join(profile_export.encode_parquet(_batches(user_id), row_group_size=2))
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+
+    assert parquet_file.metadata.num_rows == 5
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.column("name").to_pylist() == [f"Person {i}" for i in range(5)]
+    assert table.column("last_analyzed").to_pylist()[0] == START
+
+def test_export_reads_through_the_session_router_below_a_lagged_watermark(user_id, monkeypatch):
+    routed = []
+
+    class Router:
+        def read_session(self, user_key=None):
+            routed.append(user_key)
+            return SessionLocal()
+
+    monkeypatch.setattr(profile_export, "session_router", Router())
+    assert sum(len(batch) for batch in _batches(user_id)) == 5
+    assert routed == [user_id]
+
+    before = datetime.utcnow()
+    watermark = profile_export.export_watermark()
+    lag = timedelta(seconds=profile_export.WATERMARK_LAG_SECONDS)
+    assert before - lag <= watermark <= datetime.utcnow() - lag
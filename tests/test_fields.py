@@ -0,0 +1,59 @@
+# tests/test_fields.py
+import pytest
+from fastapi import HTTPException
+
+from agents.base import MessageVariant
+from api.fields import field_selection, select_fields
+from schemas.agents import AnalyzeProfileResponse
+
+def _payload():
+    variant = MessageVariant(
+        message_type="connection_request",
+        template_id=0,
+        content="Hi John",
+        tone="professional_friendly",
+        confidence_score=0.5
+    )
+    return {
+        "status": "success",
+        "profile_id": "abc",
+        "analysis": {
+            "profile_data": {"name": "John Doe"},
+            "engagement_score": 0.6,
+            "personalized_messages": [variant],
+            "selected_messages": {"connection_request": variant}
+        },
+        "errors": []
+    }
+
+def test_select_fields_keeps_only_requested_paths():
+    """Dotted paths select into nested models, lists, dicts and dataclasses"""
+
+    fields = field_selection(AnalyzeProfileResponse)(
+        "profile_id,analysis.engagement_score,analysis.personalized_messages.content,"
+        "analysis.selected_messages.template_id"
+    )
+
+    selected = select_fields(_payload(), fields, AnalyzeProfileResponse)
+
+    assert selected == {
+        "profile_id": "abc",
+        "analysis": {
+            "engagement_score": 0.6,
+            "personalized_messages": [{"content": "Hi John"}],
+            "selected_messages": {"connection_request": {"template_id": 0}}
+        }
+    }
+
+    response = AnalyzeProfileResponse.model_validate(selected)
+    assert response.model_dump(exclude_unset=True) == selected
+
+def test_no_fields_returns_payload_unchanged():
+    payload = _payload()
+    assert select_fields(payload, field_selection(AnalyzeProfileResponse)(None), AnalyzeProfileResponse) is payload
+
+@pytest.mark.parametrize("fields", ["nope", "analysis.nope", "profile_id.length"])
+def test_unknown_fields_are_rejected(fields):
+    with pytest.raises(HTTPException) as exc_info:
+        field_selection(AnalyzeProfileResponse)(fields)
+    assert exc_info.value.status_code == 400
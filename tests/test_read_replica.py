@@ -0,0 +1,194 @@
+# tests/test_read_replica.py
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import base
+from models.base import Base, SessionRouter
+from models.user import User
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=primary)
+    Base.metadata.create_all(bind=replica)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=primary), replica
+    primary.dispose()
+    replica.dispose()
+
+def _database(session):
+    return session.get_bind().url.database.rsplit("/", 1)[-1]
+
+def _write(primary, user_id):
+    with primary() as db:
+        db.info["user_id"] = user_id
+        db.add(User(email=f"{uuid.uuid4()}@example.com", hashed_password="x"))
+        db.commit()
+
+def test_reads_use_replica_except_after_own_write(databases):
+    primary, replica = databases
+    router = SessionRouter(primary, [replica], sticky_seconds=0.2)
+    writer, reader = uuid.uuid4(), uuid.uuid4()
+    
+    with router.read_session(writer) as db:
+        assert _database(db) == "replica.db"
+    
+    _write(primary, writer)
+    
+    with router.read_session(writer) as db:
+        assert _database(db) == "primary.db"
+        assert db.query(User).count() == 1  # Sees its own write
+    with router.read_session(reader) as db:
+        assert _database(db) == "replica.db"
+    
+    time.sleep(0.25)
+    with router.read_session(writer) as db:
+        assert _database(db) == "replica.db"
+    
+    # Read-only commits do not start a window
+    with primary() as db:
+        db.info["user_id"] = reader
+        db.query(User).count()
+        db.commit()
+    with router.read_session(reader) as db:
+        assert _database(db) == "replica.db"
+
+def test_stickiness_is_shared_through_redis(databases):
+    primary, replica = databases
+    
+    class FakeRedis:
+        def __init__(self):
+            self.keys = set()
+        
+        def set(self, key, value, px=None):
+            self.keys.add(key)
+        
+        def exists(self, key):
+            return int(key in self.keys)
+    
+    redis = FakeRedis()
+    # Worker A owns the session that commits; worker B only sees the shared marker
+    SessionRouter(primary, [replica], redis=lambda: redis)
+    worker_b = SessionRouter(sessionmaker(bind=primary.kw["bind"]), [replica], redis=lambda: redis)
+    user_id = uuid.uuid4()
+    
+    _write(primary, user_id)
+    
+    with worker_b.read_session(user_id) as db:
+        assert _database(db) == "primary.db"
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary(databases, monkeypatch, tmp_path):
+    primary, replica = databases
+    
+    monkeypatch.setattr(base, "replica_lag_seconds", lambda connection: 30.0)
+    router = SessionRouter(primary, [replica], max_lag_seconds=2, check_seconds=0)
+    with router.read_session(uuid.uuid4()) as db:
+        assert _database(db) == "primary.db"
+    
+    monkeypatch.setattr(base, "replica_lag_seconds", lambda connection: 0.5)
+    with router.read_session(uuid.uuid4()) as db:
+        assert _database(db) == "replica.db"
+    
+    down = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = SessionRouter(primary, [down, replica], check_seconds=60)
+    databases_used = set()
+    for _ in range(4):
+        with router.read_session(uuid.uuid4()) as db:
+            databases_used.add(_database(db))
+    assert databases_used == {"replica.db"}
+    
+    with SessionRouter(primary, [down]).read_session(uuid.uuid4()) as db:
+        assert _database(db) == "primary.db"
+
+def test_replica_probe_is_bounded_and_treats_broken_streaming_as_stale(monkeypatch):
+    created = {}
+    monkeypatch.setattr(base, "create_engine", lambda url, **kwargs: created.setdefault(url, kwargs))
+    base.replica_engine("postgresql+psycopg://reader@replica/app")
+    base.replica_engine("sqlite:///replica.db")
+    assert created["postgresql+psycopg://reader@replica/app"]["connect_args"] == {
+        "connect_timeout": base.REPLICA_CONNECT_TIMEOUT_SECONDS
+    }
+    assert created["sqlite:///replica.db"]["connect_args"] == {}
+    
+    class FakeConnection:
+        class dialect:
+            name = "postgresql"
+        
+        def __init__(self, lag):
+            self.lag = lag
+            self.statements = []
+        
+        def execute(self, statement):
+            self.statements.append(str(statement))
+            return self
+        
+        def scalar(self):
+            return self.lag
+    
+    # The lag query returns NULL when the standby's WAL receiver is not streaming
+    connection = FakeConnection(None)
+    assert base.replica_lag_seconds(connection) == float("inf")
+    assert connection.statements[0].startswith("SET LOCAL statement_timeout")
+    assert base.replica_lag_seconds(FakeConnection(0.25)) == 0.25
+
+@pytest.mark.asyncio
+async def test_read_endpoints_authenticate_without_the_primary(databases, monkeypatch):
+    from fastapi import HTTPException
+    from fastapi.security import HTTPAuthorizationCredentials
+    from sqlalchemy import event
+    
+    from api import deps
+    from services.auth import create_access_token
+    
+    primary, replica = databases
+    monkeypatch.setattr(deps, "session_router", SessionRouter(primary, [replica]))
+    
+    existing = User(email="existing@example.com", hashed_password="x")
+    with primary() as db:
+        db.add_all([existing, User(email="new@example.com", hashed_password="x")])
+        db.commit()
+        existing_id = existing.id
+    with sessionmaker(bind=replica)() as db:
+        db.add(User(id=existing_id, email="existing@example.com", hashed_password="x"))
+        db.commit()
+    
+    primary_queries = []
+    event.listen(primary, "do_orm_execute", primary_queries.append)
+    
+    def read_db(claims):
+        token = create_access_token(claims)
+        return deps.get_read_db(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    
+    sessions = read_db({"sub": "existing@example.com", "uid": str(existing_id)})
+    db = next(sessions)
+    user = await deps.get_current_read_user(db)
+    assert user.id == existing_id
+    assert _database(db) == "replica.db"
+    assert primary_queries == []
+    sessions.close()
+    
+    # A token issued before "uid" claims is looked up by email, on the primary
+    # for an account the replica has not seen yet
+    sessions = read_db({"sub": "new@example.com"})
+    db = next(sessions)
+    user = await deps.get_current_read_user(db)
+    assert user.email == "new@example.com"
+    assert len(primary_queries) == 2
+    sessions.close()
+    
+    # A deleted user's token stops working even though its id is still valid
+    with primary() as db:
+        db.query(User).filter(User.id == existing_id).delete()
+        db.commit()
+    with sessionmaker(bind=replica)() as db:
+        db.query(User).filter(User.id == existing_id).delete()
+        db.commit()
+    sessions = read_db({"sub": "existing@example.com", "uid": str(existing_id)})
+    with pytest.raises(HTTPException) as error:
+        await deps.get_current_read_user(next(sessions))
+    assert error.value.status_code == 401
+    sessions.close()
@@ -0,0 +1,61 @@
+# tests/test_search.py
+import uuid
+from types import SimpleNamespace
+
+from services.search import InMemorySearchIndex, build_prefix_tsquery
+
+def _profile(user_id, name, title, company, posts=()):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        profile_data={
+            "name": name,
+            "title": title,
+            "experience": [{"company": company}],
+            "recent_posts": [{"content": content} for content in posts]
+        }
+    )
+
+def test_in_memory_search_ranks_and_scopes_by_user():
+    """Test the SQLite fallback index matches all terms and respects ownership"""
+    
+    index = InMemorySearchIndex()
+    index._loaded = True  # No database rows to backfill
+    
+    owner, other_user = uuid.uuid4(), uuid.uuid4()
+    ml_engineer = _profile(owner, "Ada Lovelace", "ML Engineer", "Stripe")
+    poster = _profile(owner, "Grace Hopper", "Recruiter", "Acme", posts=["Hiring an ML engineer at Stripe"])
+    designer = _profile(owner, "Alan Turing", "Designer", "Stripe")
+    foreign = _profile(other_user, "Ada Smith", "ML Engineer", "Stripe")
+    for profile in (ml_engineer, poster, designer, foreign):
+        index.index_profile(None, profile)
+    
+    hits = index.search(None, owner, "ML engineer Stri")
+    
+    assert [profile_id for profile_id, _ in hits] == [ml_engineer.id, poster.id]
+    
+    index.remove_profile(None, ml_engineer.id)
+    assert [profile_id for profile_id, _ in index.search(None, owner, "ml engineer")] == [poster.id]
+
+def test_prefix_tsquery_sanitizes_input():
+    assert build_prefix_tsquery("ML engineer, Stripe!") == "ml & engineer & stripe:*"
+    assert build_prefix_tsquery("  !! ") is None
+
+def test_postgres_search_matches_typos_by_word_similarity():
+    """Test the fuzzy match compares the query with words of the document, not all of it"""
+    
+    from sqlalchemy.dialects import postgresql
+    from services.search import PostgresSearchIndex
+    
+    statements = []
+    
+    class RecordingSession:
+        def execute(self, stmt):
+            statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return []
+    
+    PostgresSearchIndex().search(RecordingSession(), uuid.uuid4(), "lovelase")
+    
+    assert "word_similarity(%(param_1)s, profile_search_documents.document)" in statements[0]
+    assert "%(param_1)s <%% profile_search_documents.document" in statements[0]
+    assert "similarity(profile_search_documents.document" not in statements[0]
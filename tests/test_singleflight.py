@@ -0,0 +1,153 @@
+# tests/test_singleflight.py
+import asyncio
+import time
+
+import pytest
+
+from agents.profile_cache import normalize_profile_url
+from services import singleflight
+from services.singleflight import SingleFlight
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+        self.channels = []
+    
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+        self.redis.subscribers.setdefault(channel, []).append(self.queue)
+    
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def aclose(self):
+        for channel in self.channels:
+            self.redis.subscribers[channel].remove(self.queue)
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the single-flight lock, result keys and wakeups"""
+    
+    def __init__(self):
+        self.values = {}
+        self.subscribers = {}
+        self.calls = 0
+    
+    def _live(self, key):
+        self.calls += 1
+        entry = self.values.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self.values.pop(key, None)
+            return None
+        return entry[0]
+    
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._live(key) is not None:
+            return None
+        value = value.encode() if isinstance(value, str) else value
+        self.values[key] = (value, time.monotonic() + px / 1000)
+        return True
+    
+    async def get(self, key):
+        return self._live(key)
+    
+    async def exists(self, key):
+        return int(self._live(key) is not None)
+    
+    async def eval(self, script, numkeys, key, token):
+        if self._live(key) == token.encode():
+            del self.values[key]
+            return 1
+        return 0
+    
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+        return len(self.subscribers.get(channel, []))
+    
+    def pubsub(self):
+        return FakePubSub(self)
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution(monkeypatch):
+    monkeypatch.setattr(singleflight, "get_async_redis", lambda: None)
+    flight = SingleFlight("test", result_ttl=10)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{"value": 42}] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+
+    # Without replay, a later call runs again
+    await flight.do("key", work)
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_remembered(monkeypatch):
+    monkeypatch.setattr(singleflight, "get_async_redis", lambda: None)
+    flight = SingleFlight("test", result_ttl=10, replay=True)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def succeed():
+        return {"ok": True}
+
+    assert await flight.do("key", succeed) == ({"ok": True}, False)
+
+@pytest.mark.asyncio
+async def test_replay_returns_stored_result(monkeypatch):
+    monkeypatch.setattr(singleflight, "get_async_redis", lambda: None)
+    flight = SingleFlight("test", result_ttl=10, replay=True)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return {"profile_id": "abc"}
+
+    assert await flight.do("user:key", work) == ({"profile_id": "abc"}, False)
+    assert await flight.do("user:key", work) == ({"profile_id": "abc"}, True)
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_workers_coalesce_through_redis(monkeypatch):
+    """A second worker waits for the lock holder's published result"""
+    redis = FakeRedis()
+    monkeypatch.setattr(singleflight, "get_async_redis", lambda: redis)
+    worker_a = SingleFlight("test", result_ttl=10)
+    worker_b = SingleFlight("test", result_ttl=10)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.3)
+        return {"value": len(calls)}
+
+    leader = asyncio.create_task(worker_a.do("key", work))
+    await asyncio.sleep(0.01)
+    follower = await worker_b.do("key", work)
+
+    assert await leader == ({"value": 1}, False)
+    assert follower == ({"value": 1}, True)
+    assert len(calls) == 1
+    # The follower was woken by the done message rather than by polling
+    assert redis.calls < 10
+    assert await redis.exists("linkedintelligence:test:lock:key") == 0
+
+def test_normalize_profile_url():
+    assert normalize_profile_url("linkedin.com/in/Jane") == "https://linkedin.com/in/jane"
+    assert normalize_profile_url("http://www.linkedin.com/in/jane/?trk=feed#top") == "https://linkedin.com/in/jane"
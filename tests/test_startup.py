@@ -0,0 +1,42 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend")
+
+# Generous enough for a cold CI runner; importing langgraph alone used to cost ~0.6s
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.5"))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "heavy_modules": sorted(name for name in ("langgraph", "langchain", "openai", "anthropic") if name in sys.modules)
+}))
+"""
+
+def test_main_import_is_fast_and_side_effect_free(tmp_path):
+    """Test importing the app stays within budget, loads no agent stack and touches no database"""
+    
+    database_path = tmp_path / "startup.db"
+    # pytest-cov traces subprocesses through COV_CORE_* variables; the budget is for the import alone
+    env = {name: value for name, value in os.environ.items() if not name.startswith("COV_CORE_")}
+    env.update(DATABASE_URL=f"sqlite:///{database_path}", SECRET_KEY="test-secret-key")
+    
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    
+    assert probe["heavy_modules"] == []
+    assert not database_path.exists()
+    assert probe["seconds"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,137 @@
+# tests/test_vector_index.py
+import uuid
+
+import numpy as np
+import pytest
+
+from agents.embedding import HashingEmbedder
+from models.base import Base, SessionLocal, engine
+from models.embedding import ProfileEmbedding
+from models.profile import LinkedInProfile
+from models.user import User
+from services import vector_index
+from services.vector_index import NumpyVectorIndex, _UserVectors, to_vector
+
+def _profile_data(title, company, posts=()):
+    return {
+        "name": "Someone",
+        "title": title,
+        "experience": [{"company": company}],
+        "recent_posts": [{"content": content} for content in posts]
+    }
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder()
+    data = _profile_data("ML Engineer", "Stripe", posts=["Shipping models"])
+    
+    vector = to_vector(embedder.embed(data))
+    
+    assert embedder.embed(data) == HashingEmbedder().embed(data)
+    assert vector.dtype == np.float32 and vector.shape == (256,)
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+    
+    # The name alone does not make two leads similar
+    same_role = to_vector(embedder.embed(_profile_data("ML Engineer", "Stripe")))
+    other_role = to_vector(embedder.embed(_profile_data("Sales Director", "Acme")))
+    assert vector @ same_role > vector @ other_role
+
+def test_lsh_search_matches_brute_force_top_hits(monkeypatch):
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((2000, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    # Near-duplicates of row 0 that any index should find
+    vectors[1:6] = vectors[0] + 0.05 * rng.standard_normal((5, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    
+    ids = [uuid.uuid4() for _ in range(len(vectors))]
+    exact = _UserVectors(64, (0, None))
+    for profile_id, vector in zip(ids, vectors):
+        exact.add(profile_id, vector)
+    expected = exact.search(ids[0], 5)
+    
+    monkeypatch.setattr(vector_index, "BRUTE_FORCE_LIMIT", 100)
+    approximate = _UserVectors(64, (0, None))
+    for profile_id, vector in zip(ids, vectors):
+        approximate.add(profile_id, vector)
+    hits = approximate.search(ids[0], 5)
+    
+    assert approximate.lsh is not None
+    assert [hit_id for hit_id, _ in hits] == [hit_id for hit_id, _ in expected]
+    assert set(hit_id for hit_id, _ in hits) == set(ids[1:6])
+    
+    # Incremental updates keep the LSH buckets in step with the matrix
+    approximate.remove(ids[1])
+    approximate.add(ids[-1], vectors[0])
+    hits = approximate.search(ids[0], 5)
+    assert hits[0][0] == ids[-1]
+    assert ids[1] not in [hit_id for hit_id, _ in hits]
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        yield session
+    Base.metadata.drop_all(bind=engine)
+
+def test_similar_updates_and_scopes_by_user(db):
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    other = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    db.add_all([user, other])
+    db.flush()
+    
+    def add_profile(owner, title, company):
+        profile = LinkedInProfile(
+            user_id=owner.id,
+            linkedin_url=f"https://linkedin.com/in/{uuid.uuid4()}",
+            profile_data=_profile_data(title, company)
+        )
+        db.add(profile)
+        db.flush()
+        return profile
+    
+    target = add_profile(user, "Staff ML Engineer", "Stripe")
+    peer = add_profile(user, "ML Engineer", "Stripe")
+    unrelated = add_profile(user, "Sales Director", "Acme")
+    add_profile(other, "Staff ML Engineer", "Stripe")
+    db.commit()
+    
+    index = NumpyVectorIndex()
+    
+    # Searching never writes; profiles analyzed before embeddings existed are
+    # embedded by backfill_embeddings.py
+    assert index.similar(db, user.id, target.id, k=5) == []
+    assert vector_index.backfill_embeddings(db, batch_size=3) == 4
+    db.commit()
+    assert db.query(ProfileEmbedding).filter(ProfileEmbedding.user_id == user.id).count() == 3
+    
+    hits = index.similar(db, user.id, target.id, k=5)
+    assert hits[0][0] == peer.id
+    assert {hit_id for hit_id, _ in hits} <= {peer.id, unrelated.id}
+    
+    # A new analysis is added to the loaded matrix without a reload
+    twin = add_profile(user, "Staff ML Engineer", "Stripe")
+    index.index_profile(db, twin.id, user.id, vector_index.embed_profile(twin.profile_data))
+    db.commit()
+    assert index.similar(db, user.id, target.id, k=1)[0] == (twin.id, pytest.approx(1.0, abs=1e-5))
+    
+    index.remove_profile(db, twin.id)
+    db.delete(twin)
+    db.commit()
+    assert index.similar(db, user.id, target.id, k=1)[0][0] == peer.id
+    
+    # Rows written by another worker invalidate the cached copy
+    other_twin = add_profile(user, "Staff ML Engineer", "Stripe")
+    NumpyVectorIndex().index_profile(db, other_twin.id, user.id, vector_index.embed_profile(other_twin.profile_data))
+    db.commit()
+    assert index.similar(db, user.id, target.id, k=1)[0][0] == other_twin.id
+
+def test_pgvector_query_scans_only_the_users_rows():
+    from sqlalchemy.dialects import postgresql
+    
+    sql = str(vector_index.similar_profiles_query(uuid.uuid4(), uuid.uuid4(), 5).compile(dialect=postgresql.dialect()))
+    
+    # A materialized per-user CTE keeps the planner off an approximate index that
+    # would be filtered by user after picking its top hits
+    assert "WITH candidates AS MATERIALIZED" in sql
+    assert sql.index("profile_embeddings.user_id") < sql.index("SELECT candidates.profile_id")
+    assert "ORDER BY candidates.embedding <=>" in sql